@@ -0,0 +1,126 @@
+"""Index page latency with and without persistent database connections.
+
+Serves the site from a pool of threads, as a threaded WSGI server does,
+on a scratch copy of ``db.json``, and requests ``/`` from concurrent
+clients: once with ``CONN_MAX_AGE = 0`` (a connection per request) and
+once keeping connections:
+
+    python benchmarks/connection_reuse.py --requests 2000 --clients 4
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / 'blogicum'
+sys.path.insert(0, str(PROJECT_DIR))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+MAX_AGES = (0, 600)
+
+
+class PooledWSGIServer:
+    """Serve requests on a fixed pool of threads, like gunicorn gthread."""
+
+    def __init__(self, threads: int):
+        from django.core.servers.basehttp import (
+            WSGIRequestHandler,
+            WSGIServer,
+            get_internal_wsgi_application,
+        )
+
+        class QuietHandler(WSGIRequestHandler):
+            def log_message(self, *args):
+                pass
+
+        pool = ThreadPoolExecutor(threads)
+
+        class Server(WSGIServer):
+            def process_request(self, request, client_address):
+                pool.submit(self._handle, request, client_address)
+
+            def _handle(self, request, client_address):
+                try:
+                    self.finish_request(request, client_address)
+                except Exception:
+                    self.handle_error(request, client_address)
+                finally:
+                    self.shutdown_request(request)
+
+        self.pool = pool
+        self.server = Server(('127.0.0.1', 0), QuietHandler)
+        self.server.set_app(get_internal_wsgi_application())
+        self.url = f'http://127.0.0.1:{self.server.server_port}/'
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever,
+                         daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+        self.pool.shutdown()
+
+
+def fetch(url: str) -> float:
+    started = time.perf_counter()
+    with urllib.request.urlopen(url) as response:
+        response.read()
+    return time.perf_counter() - started
+
+
+def run(max_age: int, requests: int, clients: int, threads: int):
+    from django.db import connections
+
+    from blogicum import dbstats
+
+    connections.databases['default']['CONN_MAX_AGE'] = max_age
+    dbstats.reset_stats()
+    with PooledWSGIServer(threads) as server:
+        fetch(server.url)  # warm up templates and caches
+        started = time.perf_counter()
+        with ThreadPoolExecutor(clients) as pool:
+            latencies = sorted(pool.map(fetch, [server.url] * requests))
+        elapsed = time.perf_counter() - started
+    stats = dbstats.get_stats()
+    print(f'CONN_MAX_AGE={max_age:<4} '
+          f'{requests / elapsed:7.0f} req/s  '
+          f'p50 {latencies[len(latencies) // 2] * 1000:6.2f} ms  '
+          f'p95 {latencies[int(len(latencies) * 0.95)] * 1000:6.2f} ms  '
+          f'opened {stats["opened"]:5}  reused {stats["reused"]:5}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--clients', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=4)
+    options = parser.parse_args()
+
+    directory = tempfile.TemporaryDirectory()
+    settings.DATABASES['default']['NAME'] = Path(directory.name) / 'db'
+    settings.DEBUG = False
+    settings.ALLOWED_HOSTS = ['127.0.0.1']
+    # Every request reaches the database instead of the page cache.
+    settings.FEED_CACHE_TIMEOUT = 0
+    django.setup()
+
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+    call_command('loaddata', str(PROJECT_DIR / 'db.json'), verbosity=0)
+    with directory:
+        for max_age in MAX_AGES:
+            run(max_age, options.requests, options.clients, options.threads)
+
+
+if __name__ == '__main__':
+    main()
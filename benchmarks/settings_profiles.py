@@ -0,0 +1,86 @@
+"""Startup time and per-request overhead of the dev and prod settings.
+
+Each profile runs in its own process, as settings are per process, on a
+scratch copy of ``db.json``: it times ``django.setup()``, the first request
+to ``/`` (templates are compiled) and then the median of the following
+ones, with the page cache off so every request renders:
+
+    python benchmarks/settings_profiles.py --requests 300
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / 'blogicum'
+PROFILES = ('dev', 'prod')
+
+
+def measure(requests: int):
+    started = time.perf_counter()
+    import django
+    from django.conf import settings
+
+    settings.DATABASES['default']['NAME'] = (
+        Path(os.environ['DJANGO_STATIC_ROOT']).parent / 'db')
+    settings.FEED_CACHE_TIMEOUT = 0
+    django.setup()
+    startup = time.perf_counter() - started
+
+    from django.core.management import call_command
+    from django.test import Client
+
+    call_command('migrate', verbosity=0)
+    call_command('loaddata', str(PROJECT_DIR / 'db.json'), verbosity=0)
+    if not settings.DEBUG:
+        call_command('collectstatic', interactive=False, verbosity=0)
+    # From INTERNAL_IPS, as a developer's browser is.
+    client = Client(REMOTE_ADDR='127.0.0.1')
+    started = time.perf_counter()
+    client.get('/')
+    first = time.perf_counter() - started
+    timings = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        client.get('/')
+        timings.append(time.perf_counter() - started)
+    print(f'{os.environ["BLOGICUM_ENV"]:5} '
+          f'setup {startup * 1000:7.1f} ms  '
+          f'first request {first * 1000:7.1f} ms  '
+          f'median request {statistics.median(timings) * 1000:6.2f} ms  '
+          f'middleware {len(settings.MIDDLEWARE):2}  '
+          f'apps {len(settings.INSTALLED_APPS):2}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--requests', type=int, default=300)
+    parser.add_argument('--child', action='store_true',
+                        help=argparse.SUPPRESS)
+    options = parser.parse_args()
+    if options.child:
+        sys.path.insert(0, str(PROJECT_DIR))
+        measure(options.requests)
+        return
+    for profile in PROFILES:
+        with tempfile.TemporaryDirectory() as directory:
+            env = {
+                **os.environ,
+                'DJANGO_SETTINGS_MODULE': 'blogicum.settings',
+                'BLOGICUM_ENV': profile,
+                'DJANGO_SECRET_KEY': 'benchmark-' * 5,
+                'DJANGO_ALLOWED_HOSTS': 'testserver',
+                'DJANGO_STATIC_ROOT': str(Path(directory) / 'static'),
+            }
+            # stderr carries the request log lines of the dev profile.
+            subprocess.run([sys.executable, __file__, '--child',
+                            '--requests', str(options.requests)],
+                           env=env, check=True, stderr=subprocess.DEVNULL)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""Feed reads per second while comments are being written.
+
+Runs reader and writer processes against a scratch database shaped like
+``blog_post`` and ``blog_comment``, once with Django's stock SQLite setup
+(rollback journal, deferred ``BEGIN``) and once with the pragmas and
+``BEGIN IMMEDIATE`` of ``blogicum.sqlite``:
+
+    python benchmarks/sqlite_contention.py --seconds 10 --readers 4
+"""
+import argparse
+import multiprocessing
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'blogicum'))
+
+from blogicum.sqlite.base import PRAGMAS  # noqa: E402
+
+POSTS = 5000
+BUSY_TIMEOUT = 5
+FEED_QUERY = ('SELECT id, title, pub_date, comment_count FROM post '
+              'WHERE is_published ORDER BY pub_date DESC LIMIT 10 OFFSET ?')
+PROFILES = {
+    'stock': ({}, 'BEGIN'),
+    'tuned': (PRAGMAS, 'BEGIN IMMEDIATE'),
+}
+
+
+def connect(path, pragmas):
+    connection = sqlite3.connect(path, timeout=BUSY_TIMEOUT,
+                                 isolation_level=None)
+    for name, value in pragmas.items():
+        connection.execute(f'PRAGMA {name} = {value}')
+    return connection
+
+
+def create_database(path):
+    connection = sqlite3.connect(path, isolation_level=None)
+    connection.executescript('''
+        CREATE TABLE post (id INTEGER PRIMARY KEY, title TEXT,
+            text TEXT, pub_date REAL, is_published BOOL,
+            comment_count INTEGER);
+        CREATE INDEX post_feed ON post (pub_date) WHERE is_published;
+        CREATE TABLE comment (id INTEGER PRIMARY KEY, post_id INTEGER,
+            text TEXT, created_at REAL);
+        CREATE INDEX comment_post ON comment (post_id, created_at);
+    ''')
+    connection.executemany(
+        'INSERT INTO post VALUES (?, ?, ?, ?, 1, 0)',
+        ((i, f'Post {i}', 'text ' * 200, i) for i in range(1, POSTS + 1)))
+    connection.close()
+
+
+def read(path, pragmas, deadline, results):
+    connection = connect(path, pragmas)
+    reads, errors, latencies = 0, 0, []
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        try:
+            connection.execute(FEED_QUERY, (reads % 100 * 10,)).fetchall()
+        except sqlite3.OperationalError:
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - started)
+        reads += 1
+    results.put(('read', reads, errors, latencies))
+
+
+def write(path, pragmas, begin, deadline, results):
+    connection = connect(path, pragmas)
+    writes, errors = 0, 0
+    while time.monotonic() < deadline:
+        post_id = writes % POSTS + 1
+        try:
+            connection.execute(begin)
+            # Like CommentCreateView: check the post, then write.
+            connection.execute('SELECT id FROM post WHERE id = ?',
+                               (post_id,)).fetchone()
+            connection.execute(
+                'INSERT INTO comment (post_id, text, created_at) '
+                'VALUES (?, ?, ?)', (post_id, 'comment', time.time()))
+            connection.execute('UPDATE post SET comment_count = '
+                               'comment_count + 1 WHERE id = ?', (post_id,))
+            connection.execute('COMMIT')
+            writes += 1
+        except sqlite3.OperationalError:
+            if connection.in_transaction:
+                connection.execute('ROLLBACK')
+            errors += 1
+    results.put(('write', writes, errors, []))
+
+
+def run(profile, seconds, readers, writers):
+    pragmas, begin = PROFILES[profile]
+    with tempfile.TemporaryDirectory() as directory:
+        path = str(Path(directory) / 'db.sqlite3')
+        create_database(path)
+        # Journal mode is stored in the file; set it before the race.
+        connect(path, pragmas).close()
+        results = multiprocessing.Queue()
+        deadline = time.monotonic() + seconds
+        processes = [
+            *(multiprocessing.Process(
+                target=read, args=(path, pragmas, deadline, results))
+              for _ in range(readers)),
+            *(multiprocessing.Process(
+                target=write, args=(path, pragmas, begin, deadline, results))
+              for _ in range(writers)),
+        ]
+        for process in processes:
+            process.start()
+        totals = {'read': [0, 0, []], 'write': [0, 0, []]}
+        for _ in processes:
+            kind, count, errors, latencies = results.get()
+            totals[kind][0] += count
+            totals[kind][1] += errors
+            totals[kind][2] += latencies
+        for process in processes:
+            process.join()
+    latencies = sorted(totals['read'][2]) or [0]
+    p95 = latencies[int(len(latencies) * 0.95)] * 1000
+    print(f'{profile:6} reads/s {totals["read"][0] / seconds:9.0f}  '
+          f'p95 {p95:7.2f} ms  read errors {totals["read"][1]:5}  '
+          f'writes/s {totals["write"][0] / seconds:7.0f}  '
+          f'write errors {totals["write"][1]:5}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--profile', choices=PROFILES, action='append')
+    options = parser.parse_args()
+    for profile in options.profile or PROFILES:
+        run(profile, options.seconds, options.readers, options.writers)
+
+
+if __name__ == '__main__':
+    main()
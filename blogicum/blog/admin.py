@@ -1,6 +1,28 @@
 from django.contrib import admin
 
+from search.backends import get_backend
+
+from .cache import invalidate_feed_cache
 from .models import Category, Comment, Location, Post
+from .publication import reset_next_publication
+
+
+def _set_published(queryset, is_published: bool):
+    # update() keeps updated_at current but sends no signals, so do what
+    # their receivers would have done.
+    queryset.update(is_published=is_published)
+    invalidate_feed_cache()
+    reset_next_publication()
+
+
+@admin.action(description='Publish selected')
+def publish(modeladmin, request, queryset):
+    _set_published(queryset, True)
+
+
+@admin.action(description='Hide selected')
+def unpublish(modeladmin, request, queryset):
+    _set_published(queryset, False)
 
 
 class PostInline(admin.StackedInline):
@@ -12,6 +34,7 @@ class CategoryAdmin(admin.ModelAdmin):
     inlines = (
         PostInline,
     )
+    actions = (publish, unpublish)
 
 
 class PostAdmin(admin.ModelAdmin):
@@ -32,6 +55,13 @@ class PostAdmin(admin.ModelAdmin):
     search_fields = ('title',)
     list_filter = ('is_published',)
     list_display_links = ('title',)
+    actions = (publish, unpublish)
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return (get_backend().filter_matching(queryset, search_term),
+                False)
 
 
 admin.site.register(Post, PostAdmin)
@@ -0,0 +1,194 @@
+"""Rendered feed pages, page counts, RSS and Atom feeds and post cards.
+
+Feed page, count and RSS/Atom entries are never deleted one by one: every
+key embeds a generation number which is bumped whenever a post, comment,
+category or location changes, so all stale pages become unreachable at once
+and simply expire. Post cards are keyed by the ``updated_at`` of everything
+the card shows, so an edited post, category or location or a new comment
+changes the key. The generation itself is kept in the default cache, which
+holds only a few keys, so culling a full feed cache never evicts it.
+
+Hits and misses are counted in each process and added to the totals in the
+default cache at most every ``STATS_FLUSH_INTERVAL`` seconds, so a cache hit
+does not write to a shared cache.
+"""
+import threading
+import time
+from collections import Counter
+from hashlib import md5
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.template.loader import render_to_string
+
+from .models import Post
+from .publication import seconds_until_next_publication
+
+FEED_CACHE_ALIAS = 'feed'
+GENERATION_KEY = 'feed:generation'
+HITS_KEY = 'feed:hits'
+MISSES_KEY = 'feed:misses'
+POST_CARD_TEMPLATE = 'includes/post_card.html'
+# Bump when POST_CARD_TEMPLATE changes so persistent caches drop old cards.
+POST_CARD_TEMPLATE_VERSION = 2
+# Bump when what set_page() stores changes.
+PAGE_FORMAT_VERSION = 2
+STATS_FLUSH_INTERVAL = 10
+
+_stats_lock = threading.Lock()
+_pending_stats = Counter()
+_stats_flushed_at = time.monotonic()
+
+
+def get_feed_cache():
+    return caches[FEED_CACHE_ALIAS]
+
+
+def _new_generation() -> int:
+    # A cleared or restarted cache loses the generation; a reseeded one
+    # must not match the number of any page still in the feed cache.
+    return time.time_ns()
+
+
+def _get_generation() -> int:
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        generation = _new_generation()
+        if not cache.add(GENERATION_KEY, generation, timeout=None):
+            generation = cache.get(GENERATION_KEY, generation)
+    return generation
+
+
+def _count(key: str):
+    with _stats_lock:
+        _pending_stats[key] += 1
+        due = time.monotonic() - _stats_flushed_at >= STATS_FLUSH_INTERVAL
+    if due:
+        flush_stats()
+
+
+def flush_stats():
+    """Add the counts of this process to the shared totals."""
+    global _stats_flushed_at
+    with _stats_lock:
+        pending = dict(_pending_stats)
+        _pending_stats.clear()
+        _stats_flushed_at = time.monotonic()
+    for key, value in pending.items():
+        try:
+            cache.incr(key, value)
+        except ValueError:
+            cache.set(key, value, timeout=None)
+
+
+def invalidate_feed_cache():
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, _new_generation(), timeout=None)
+
+
+def make_page_key(view_name: str, view_args: Iterable[str],
+                  query: Dict[str, str]) -> str:
+    raw = '|'.join((view_name, *view_args,
+                    *(f'{name}={value}'
+                      for name, value in sorted(query.items()))))
+    return (f'feed:page:{_get_generation()}:'
+            f'{md5(raw.encode()).hexdigest()}')
+
+
+def make_count_key(view_name: str, view_args: Iterable[str]) -> str:
+    raw = '|'.join((view_name, *view_args))
+    return (f'feed:count:{_get_generation()}:'
+            f'{md5(raw.encode()).hexdigest()}')
+
+
+def make_feed_key(view_name: str, view_args: Iterable[str],
+                  origin: str) -> str:
+    """Key of an RSS or Atom body; its links are absolute, hence ``origin``."""
+    raw = '|'.join((view_name, *view_args, origin))
+    return (f'feed:syndication:{_get_generation()}:'
+            f'{md5(raw.encode()).hexdigest()}')
+
+
+def get_count(key: str) -> Optional[int]:
+    return get_feed_cache().get(key)
+
+
+def set_count(key: str, total: int):
+    timeout = seconds_until_next_publication(settings.FEED_CACHE_TIMEOUT)
+    if timeout:
+        get_feed_cache().set(key, total, timeout=timeout)
+
+
+def get_page(key: str) -> Optional[Tuple[bytes, Optional[str]]]:
+    """Return the cached content and ETag stored under ``key``."""
+    page = get_feed_cache().get(key, version=PAGE_FORMAT_VERSION)
+    _count(HITS_KEY if page is not None else MISSES_KEY)
+    return page
+
+
+def set_page(key: str, content: bytes, etag: Optional[str] = None):
+    timeout = seconds_until_next_publication(settings.FEED_CACHE_TIMEOUT)
+    if timeout:
+        get_feed_cache().set(key, (content, etag), timeout=timeout,
+                             version=PAGE_FORMAT_VERSION)
+
+
+def get_feed(key: str) -> Optional[bytes]:
+    # Feed readers poll on their own; their hits stay out of the stats.
+    return get_feed_cache().get(key)
+
+
+def set_feed(key: str, content: bytes):
+    timeout = seconds_until_next_publication(settings.FEED_CACHE_TIMEOUT)
+    if timeout:
+        get_feed_cache().set(key, content, timeout=timeout)
+
+
+def get_stats() -> Dict[str, int]:
+    flush_stats()
+    counters = cache.get_many((HITS_KEY, MISSES_KEY))
+    return {
+        'hits': counters.get(HITS_KEY, 0),
+        'misses': counters.get(MISSES_KEY, 0),
+    }
+
+
+def reset_stats():
+    with _stats_lock:
+        _pending_stats.clear()
+    cache.delete_many((HITS_KEY, MISSES_KEY))
+
+
+def get_card_version(post: Post) -> str:
+    category = post.category
+    location = post.location
+    # Comments and image processing update the post's row as well.
+    stamp = (
+        post.pk, post.updated_at.isoformat(), post.author.username,
+        category and category.updated_at.isoformat(),
+        location and location.updated_at.isoformat(),
+    )
+    return md5(repr(stamp).encode()).hexdigest()
+
+
+def get_post_cards(posts: List[Post]) -> List[str]:
+    """Return rendered cards for ``posts``, rendering only cache misses."""
+    feed_cache = get_feed_cache()
+    keys = {post.pk: f'card:{post.pk}:{get_card_version(post)}'
+            for post in posts}
+    cards = feed_cache.get_many(keys.values(),
+                                version=POST_CARD_TEMPLATE_VERSION)
+    rendered = {}
+    for post in posts:
+        key = keys[post.pk]
+        if key not in cards:
+            rendered[key] = cards[key] = render_to_string(
+                POST_CARD_TEMPLATE, {'post': post})
+    if rendered:
+        feed_cache.set_many(rendered,
+                            timeout=settings.POST_CARD_CACHE_TIMEOUT,
+                            version=POST_CARD_TEMPLATE_VERSION)
+    return [cards[keys[post.pk]] for post in posts]
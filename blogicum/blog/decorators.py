@@ -1,3 +1,5 @@
+from functools import wraps
+
 STR_CLASS_LENGHT = 20
 
 
@@ -9,3 +11,15 @@ def cut_str(func,
             return str_res
         return str_res[:length] + '...'
     return wrapper
+
+
+def memoize_per_request(method):
+    """Compute a view lookup once: views are instantiated per request."""
+    attr_name = f'_memoized_{method.__name__}'
+
+    @wraps(method)
+    def wrapper(self):
+        if attr_name not in self.__dict__:
+            self.__dict__[attr_name] = method(self)
+        return self.__dict__[attr_name]
+    return wrapper
@@ -0,0 +1,248 @@
+"""RSS and Atom feeds of the main page, a category and an author.
+
+Feeds are streamed item by item while the posts are read with
+``iterator()``, and the finished document is kept in the feed cache, so
+it is rendered again only after a post changes or a scheduled post goes
+live. ``ETag`` and ``Last-Modified`` come from the ``pub_date`` and
+``updated_at`` of the items in the feed, read with one bounded query, and
+are checked before the cache or the posts are read.
+"""
+from calendar import timegm
+from hashlib import md5
+from io import StringIO
+from typing import Any, Iterable, Iterator, List, Tuple
+
+from django.contrib.auth import get_user_model
+from django.db.models import QuerySet
+from django.http import (
+    Http404,
+    HttpResponse,
+    StreamingHttpResponse,
+)
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import (
+    Atom1Feed,
+    Rss201rev2Feed,
+)
+from django.utils.http import http_date, quote_etag
+from django.utils.xmlutils import SimplerXMLGenerator
+from django.views import View
+
+from . import cache as feed_cache
+from .decorators import memoize_per_request
+from .mixin import ReplicaReadMixin
+from .models import Category
+from .paginators import FEED_ORDERING
+from .utils import get_posts
+
+User = get_user_model()
+FEED_ITEMS = 50
+ITEMS_PER_CHUNK = 10
+SITE_TITLE = 'Blogicum'
+
+
+class StreamingFeedMixin:
+    """Write a feed generator's document in chunks instead of at once."""
+
+    item_element = 'item'
+    encoding = 'utf-8'
+
+    def __init__(self, *args, newest=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.newest = newest
+
+    def latest_post_date(self):
+        # The base class would need every item up front to find it.
+        return self.newest or super().latest_post_date()
+
+    def start_document(self, handler: SimplerXMLGenerator):
+        raise NotImplementedError
+
+    def end_document(self, handler: SimplerXMLGenerator):
+        raise NotImplementedError
+
+    def stream(self, items: Iterable[dict]) -> Iterator[bytes]:
+        """Yield the encoded document, ``items`` being ``add_item`` kwargs."""
+        output = StringIO()
+        handler = SimplerXMLGenerator(output, self.encoding,
+                                      short_empty_elements=True)
+
+        def drain() -> bytes:
+            chunk = output.getvalue().encode(self.encoding)
+            output.seek(0)
+            output.truncate()
+            return chunk
+
+        handler.startDocument()
+        self.start_document(handler)
+        yield drain()
+        for position, item in enumerate(items, 1):
+            self.add_item(**item)
+            item = self.items.pop()
+            handler.startElement(self.item_element,
+                                 self.item_attributes(item))
+            self.add_item_elements(handler, item)
+            handler.endElement(self.item_element)
+            if position % ITEMS_PER_CHUNK == 0:
+                yield drain()
+        self.end_document(handler)
+        yield drain()
+
+
+class StreamingRssFeed(StreamingFeedMixin, Rss201rev2Feed):
+
+    def start_document(self, handler):
+        handler.startElement('rss', self.rss_attributes())
+        handler.startElement('channel', self.root_attributes())
+        self.add_root_elements(handler)
+
+    def end_document(self, handler):
+        self.endChannelElement(handler)
+        handler.endElement('rss')
+
+
+class StreamingAtomFeed(StreamingFeedMixin, Atom1Feed):
+    item_element = 'entry'
+
+    def start_document(self, handler):
+        handler.startElement('feed', self.root_attributes())
+        self.add_root_elements(handler)
+
+    def end_document(self, handler):
+        handler.endElement('feed')
+
+
+FEED_FORMATS = {
+    'rss': StreamingRssFeed,
+    'atom': StreamingAtomFeed,
+}
+
+
+class PostFeedView(ReplicaReadMixin, View):
+    """Feed of the posts from ``get_queryset()``, newest first."""
+
+    title = SITE_TITLE
+    description = 'New publications'
+
+    def get_queryset(self) -> QuerySet:
+        return get_posts(to_filter=True)
+
+    def get_link(self) -> str:
+        return reverse('blog:index')
+
+    def get_title(self) -> str:
+        return self.title
+
+    def get_feed_class(self):
+        try:
+            return FEED_FORMATS[self.kwargs['feed_format']]
+        except KeyError:
+            raise Http404('Unknown feed format')
+
+    def get_items(self) -> Iterator[dict]:
+        posts = self.get_queryset().order_by(*FEED_ORDERING)[:FEED_ITEMS]
+        for post in posts.iterator(chunk_size=FEED_ITEMS):
+            link = self.request.build_absolute_uri(
+                reverse('blog:post_detail', args=[post.id]))
+            yield {
+                'title': post.title,
+                'link': link,
+                'unique_id': link,
+                'description': post.text,
+                'pubdate': post.pub_date,
+                'author_name': post.author.get_username(),
+                'categories': (post.category.title,),
+            }
+
+    def get(self, request, *args, **kwargs):
+        feed_class = self.get_feed_class()
+        # What the feed shows: the same indexed slice get_items() reads.
+        stamps = list(self.get_queryset()
+                      .order_by(*FEED_ORDERING)
+                      .values_list('id', 'pub_date', 'updated_at',
+                                   'category__updated_at')[:FEED_ITEMS])
+        etag, last_modified = self.get_validators(stamps)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = self.render(feed_class,
+                                   stamps[0][1] if stamps else None)
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def get_validators(self, stamps: List[Tuple[Any, ...]]):
+        raw = repr((self.request.path, *stamps))
+        etag = quote_etag(md5(raw.encode()).hexdigest())
+        dates = [date for _, *dates in stamps for date in dates
+                 if date is not None]
+        last_modified = timegm(max(dates).utctimetuple()) if dates else None
+        return etag, last_modified
+
+    def render(self, feed_class, newest):
+        content_type = feed_class.content_type
+        request = self.request
+        key = feed_cache.make_feed_key(
+            request.resolver_match.view_name,
+            [str(value) for value in self.kwargs.values()],
+            f'{request.scheme}://{request.get_host()}')
+        content = feed_cache.get_feed(key)
+        if content is not None:
+            return HttpResponse(content, content_type=content_type)
+        feed = feed_class(
+            title=self.get_title(),
+            link=self.request.build_absolute_uri(self.get_link()),
+            description=self.description,
+            feed_url=self.request.build_absolute_uri(),
+            language='en',
+            newest=newest,
+        )
+        return StreamingHttpResponse(
+            self._cache_when_done(feed.stream(self.get_items()), key),
+            content_type=content_type)
+
+    @staticmethod
+    def _cache_when_done(chunks: Iterable[bytes],
+                         key: str) -> Iterator[bytes]:
+        rendered = []
+        for chunk in chunks:
+            rendered.append(chunk)
+            yield chunk
+        feed_cache.set_feed(key, b''.join(rendered))
+
+
+class CategoryFeedView(PostFeedView):
+
+    @memoize_per_request
+    def get_category(self) -> Category:
+        return get_object_or_404(Category, slug=self.kwargs['category_slug'],
+                                 is_published=True)
+
+    def get_queryset(self):
+        return super().get_queryset().filter(category=self.get_category())
+
+    def get_link(self):
+        return reverse('blog:category_posts',
+                       args=[self.get_category().slug])
+
+    def get_title(self):
+        return f'{self.title}: {self.get_category().title}'
+
+
+class ProfileFeedView(PostFeedView):
+
+    @memoize_per_request
+    def get_author(self):
+        return get_object_or_404(User, username=self.kwargs['username'])
+
+    def get_queryset(self):
+        return super().get_queryset().filter(author=self.get_author())
+
+    def get_link(self):
+        return reverse('blog:profile', args=[self.get_author().username])
+
+    def get_title(self):
+        return f'{self.title}: @{self.get_author().username}'
@@ -0,0 +1,165 @@
+"""Optimized originals and resized renditions of post images.
+
+Every uploaded ``Post.image`` is first re-encoded without its metadata,
+capped to ``MAX_IMAGE_SIDE`` and stored in the smallest of
+``OPTIMIZED_FORMATS`` and its own format, unless it has no metadata, fits
+and is already smaller than that. It then gets downscaled copies
+stored next to it in ``posts_images/renditions/``. Feed cards use the small
+ones and the post page the large one, both through ``srcset`` so browsers
+pick the best fit.
+"""
+import logging
+import posixpath
+from io import BytesIO
+from typing import Dict, List, Optional, Tuple
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+RENDITIONS_DIR = 'renditions'
+CARD_WIDTHS = (320, 640)
+DETAIL_WIDTHS = (1280,)
+RENDITION_WIDTHS = CARD_WIDTHS + DETAIL_WIDTHS
+MAX_IMAGE_SIDE = 2560
+# Tried in order; formats this Pillow build cannot encode are skipped.
+OPTIMIZED_FORMATS = ('AVIF', 'WEBP')
+EXTENSIONS = {'AVIF': '.avif', 'WEBP': '.webp'}
+ENCODE_OPTIONS: Dict[str, Dict] = {
+    'JPEG': {'quality': 82, 'optimize': True, 'progressive': True},
+    'PNG': {'optimize': True},
+    'WEBP': {'quality': 80, 'method': 6},
+    'AVIF': {'quality': 60},
+}
+# ``Image.info`` entries that are part of the picture rather than metadata.
+PICTURE_INFO = ('transparency',)
+# Entries that make an upload worth re-encoding even if it grows.
+METADATA_INFO = ('exif', 'icc_profile', 'xmp', 'XML:com.adobe.xmp',
+                 'comment', 'photoshop')
+
+
+def get_rendition_name(image_name: str, width: int) -> str:
+    directory, filename = posixpath.split(image_name)
+    stem, extension = posixpath.splitext(filename)
+    return posixpath.join(directory, RENDITIONS_DIR,
+                          f'{stem}_{width}w{extension}')
+
+
+def parse_widths(widths: str) -> List[int]:
+    return [int(width) for width in widths.split(',') if width]
+
+
+def get_renditions(image, widths: str,
+                   max_width: int) -> List[Tuple[str, int]]:
+    """``(url, width)`` pairs of the renditions no wider than ``max_width``."""
+    storage = image.storage
+    return [(storage.url(get_rendition_name(image.name, width)), width)
+            for width in parse_widths(widths) if width <= max_width]
+
+
+def _open(image) -> Tuple[Optional[Image.Image], int]:
+    """Return the upright picture and the stored size of ``image``."""
+    try:
+        with image.storage.open(image.name) as source:
+            size = source.size
+            picture = Image.open(source)
+            if getattr(picture, 'is_animated', False):
+                # Re-encoding would keep only the first frame.
+                return None, size
+            image_format = picture.format
+            picture = ImageOps.exif_transpose(picture)
+            picture.load()
+            picture.format = image_format
+    except (OSError, ValueError, Image.DecompressionBombError) as error:
+        logger.warning('Cannot read image %s: %s', image.name, error)
+        return None, 0
+    return picture, size
+
+
+def _strip_metadata(picture: Image.Image):
+    # Encoders fall back to ``info`` for EXIF, ICC profiles and text chunks.
+    picture.info = {key: value for key, value in picture.info.items()
+                    if key in PICTURE_INFO}
+
+
+def _encode(picture: Image.Image, image_format: str) -> Optional[bytes]:
+    _strip_metadata(picture)
+    if image_format == 'JPEG':
+        picture = picture.convert('RGB')
+    buffer = BytesIO()
+    try:
+        picture.save(buffer, format=image_format,
+                     **ENCODE_OPTIONS.get(image_format, {}))
+    except (OSError, KeyError, ValueError) as error:
+        logger.debug('Cannot encode %s: %s', image_format, error)
+        return None
+    return buffer.getvalue()
+
+
+def optimize_image(image) -> Tuple[int, int]:
+    """Store ``image`` re-encoded, return its sizes before and after.
+
+    The new file gets a name of its own and ``image.name`` is pointed at it;
+    the original is kept for the caller to delete once nothing refers to it.
+    An upload that is small enough, carries no metadata and would only grow
+    is left as it is.
+    """
+    picture, original_size = _open(image)
+    if picture is None:
+        return original_size, original_size
+    source_format = picture.format
+    must_encode = (max(picture.size) > MAX_IMAGE_SIDE
+                   or any(key in picture.info for key in METADATA_INFO))
+    picture.thumbnail((MAX_IMAGE_SIDE, MAX_IMAGE_SIDE), Image.LANCZOS)
+    encoded = None
+    for image_format in OPTIMIZED_FORMATS:
+        encoded = _encode(picture, image_format)
+        if encoded is not None:
+            break
+    # Encoding without metadata in the source format is the fallback when
+    # no modern encoder is available or it does worse.
+    fallback = _encode(picture, source_format)
+    stem = posixpath.splitext(image.name)[0]
+    name = image.name
+    if encoded is not None and (fallback is None
+                                or len(encoded) < len(fallback)):
+        name = stem + EXTENSIONS[image_format]
+    elif fallback is not None:
+        encoded = fallback
+    else:
+        return original_size, original_size
+    if not must_encode and len(encoded) >= original_size:
+        return original_size, original_size
+    image.name = image.storage.save(name, ContentFile(encoded))
+    return original_size, len(encoded)
+
+
+def delete_image(storage, name: str, widths: str = ''):
+    """Delete a stored image and the renditions listed in ``widths``."""
+    for width in parse_widths(widths):
+        storage.delete(get_rendition_name(name, width))
+    storage.delete(name)
+
+
+def generate_renditions(image) -> str:
+    """Write renditions of ``image``, return their widths as stored."""
+    picture, _ = _open(image)
+    if picture is None:
+        return ''
+    widths = sorted({min(width, picture.width)
+                     for width in RENDITION_WIDTHS})
+    return ','.join(str(width) for width in widths
+                    if _save_rendition(image, picture, width))
+
+
+def _save_rendition(image, picture: Image.Image, width: int) -> bool:
+    rendition = picture.copy()
+    rendition.thumbnail((width, picture.height), Image.LANCZOS)
+    content = _encode(rendition, picture.format)
+    if content is None:
+        return False
+    name = get_rendition_name(image.name, width)
+    image.storage.delete(name)
+    image.storage.save(name, ContentFile(content))
+    return True
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from blog.cache import get_stats, reset_stats
+
+
+class Command(BaseCommand):
+    help = 'Show hit/miss counters of the anonymous feed page cache.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true',
+                            help='Zero the counters after printing them.')
+
+    def handle(self, *args, reset: bool, **options):
+        stats = get_stats()
+        total = stats['hits'] + stats['misses']
+        ratio = stats['hits'] / total if total else 0
+        self.stdout.write(f"hits: {stats['hits']}\n"
+                          f"misses: {stats['misses']}\n"
+                          f'hit ratio: {ratio:.1%}')
+        if reset:
+            reset_stats()
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from blog.images import generate_renditions
+from blog.models import Post
+
+CHUNK_SIZE = 200
+
+
+class Command(BaseCommand):
+    help = 'Create resized copies of post images uploaded before renditions.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', dest='regenerate',
+                            help='Regenerate renditions of every image.')
+
+    def handle(self, *args, regenerate: bool, **options):
+        posts = Post.objects.exclude(image='').only('id', 'image')
+        if not regenerate:
+            posts = posts.filter(image_widths='')
+        processed = 0
+        for post in posts.iterator(chunk_size=CHUNK_SIZE):
+            widths = generate_renditions(post.image)
+            Post.objects.filter(pk=post.pk).update(image_widths=widths)
+            processed += 1
+        self.stdout.write(self.style.SUCCESS(
+            f'Processed {processed} images.'))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+
+CHUNK_SIZE = 2000
+
+
+class Command(BaseCommand):
+    help = 'Show how many bytes re-encoding of post images has saved.'
+
+    def handle(self, *args, **options):
+        sizes = (Post.objects
+                 .exclude(image_sizes={})
+                 .values_list('image_sizes', flat=True))
+        images = original = optimized = 0
+        for image_sizes in sizes.iterator(chunk_size=CHUNK_SIZE):
+            images += 1
+            original += image_sizes['original']
+            optimized += image_sizes['optimized']
+        saved = original - optimized
+        ratio = saved / original if original else 0
+        self.stdout.write(f'images: {images}\n'
+                          f'uploaded: {original} bytes\n'
+                          f'stored: {optimized} bytes\n'
+                          f'saved: {saved} bytes ({ratio:.1%})')
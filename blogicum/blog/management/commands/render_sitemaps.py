@@ -0,0 +1,77 @@
+import os
+from pathlib import Path
+from typing import Iterable, List
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+
+from blog.sitemaps import (
+    SECTIONS,
+    encode_chunks,
+    get_post_chunks,
+    iter_index,
+    iter_post_urls,
+    iter_section_urls,
+    urlset,
+)
+
+# Stands for the chunk number when matching post sitemap file names.
+CHUNK_WILDCARD = 987654321
+
+
+class Command(BaseCommand):
+    help = ('Write the sitemap index and every sitemap to files, named as '
+            'their URLs, for the web server to serve.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('base_url',
+                            help='Site root the URLs start with, e.g. '
+                                 'https://blogicum.example')
+        parser.add_argument('--output', type=Path,
+                            default=settings.SITEMAPS_DIR,
+                            help='Directory to write the files to.')
+
+    def handle(self, *args, base_url: str, output: Path, **options):
+        base_url = base_url.rstrip('/')
+
+        def absolute(path: str) -> str:
+            return base_url + path
+
+        output.mkdir(parents=True, exist_ok=True)
+        written = [self._write(output, reverse('blog:sitemap_index'),
+                               iter_index(absolute))]
+        for chunk, _ in get_post_chunks():
+            written.append(self._write(
+                output, reverse('blog:sitemap_posts', args=[chunk]),
+                urlset(iter_post_urls(chunk, absolute))))
+        for section in SECTIONS:
+            written.append(self._write(
+                output, reverse('blog:sitemap', args=[section]),
+                urlset(iter_section_urls(section, absolute))))
+        stale = self._remove_stale_chunks(output, written)
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {len(written)} sitemaps to {output}, removed '
+            f'{stale} stale ones.'))
+
+    @staticmethod
+    def _remove_stale_chunks(output: Path, written: List[Path]) -> int:
+        """Delete post sitemaps of chunks that have no visible posts now."""
+        pattern = (reverse('blog:sitemap_posts', args=[CHUNK_WILDCARD])
+                   .lstrip('/').replace(str(CHUNK_WILDCARD), '*'))
+        stale = [path for path in output.glob(pattern)
+                 if path not in written]
+        for path in stale:
+            path.unlink()
+        return len(stale)
+
+    @staticmethod
+    def _write(output: Path, url: str, lines: Iterable[str]) -> Path:
+        path = output / url.lstrip('/')
+        temporary = path.with_suffix('.tmp')
+        # Crawlers never see a half-written file.
+        with open(temporary, 'wb') as file:
+            for chunk in encode_chunks(lines):
+                file.write(chunk)
+        os.replace(temporary, path)
+        return path
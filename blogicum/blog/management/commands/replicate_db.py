@@ -0,0 +1,49 @@
+import sqlite3
+import time
+from contextlib import closing
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from blog.cache import invalidate_feed_cache
+from blog.publication import reset_next_publication
+from blogicum.routers import REPLICA_ALIAS
+
+
+class Command(BaseCommand):
+    help = ('Copy the default SQLite database over the replica with the '
+            'online backup API; readers of the replica are not stopped.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=0,
+                            help='Copy again every that many seconds, '
+                                 'instead of once.')
+
+    def handle(self, *args, interval: float, **options):
+        replica = settings.DATABASES.get(REPLICA_ALIAS)
+        if replica is None:
+            raise CommandError('No replica database: set DATABASE_REPLICA '
+                               'to the file it is kept in.')
+        primary = connections[DEFAULT_DB_ALIAS]
+        if primary.vendor != 'sqlite':
+            raise CommandError('replicate_db only copies SQLite databases.')
+        timeout = replica.get('OPTIONS', {}).get('timeout', 5)
+        while True:
+            started = time.monotonic()
+            primary.ensure_connection()
+            with closing(sqlite3.connect(replica['NAME'],
+                                         timeout=timeout)) as target:
+                # One step: the replica never shows half a copy.
+                primary.connection.backup(target)
+            # A write bumps the generation before the replica has it, so
+            # pages rendered from the replica in between are stale under
+            # the new one too; drop them now that the replica caught up.
+            invalidate_feed_cache()
+            reset_next_publication()
+            self.stdout.write(self.style.SUCCESS(
+                f'Copied the database to {replica["NAME"]} in '
+                f'{time.monotonic() - started:.2f} s.'))
+            if not interval:
+                return
+            time.sleep(interval)
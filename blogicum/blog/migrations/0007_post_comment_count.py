@@ -0,0 +1,34 @@
+# Generated by Django 3.2.16 on 2026-10-18 18:49
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def fill_comment_count(apps, schema_editor):
+    Comment = apps.get_model('blog', 'Comment')
+    Post = apps.get_model('blog', 'Post')
+    Post.objects.update(comment_count=Coalesce(models.Subquery(
+        Comment.objects
+        .filter(post=models.OuterRef('pk'))
+        .order_by()
+        .values('post')
+        .annotate(total=models.Count('pk'))
+        .values('total'),
+        output_field=models.IntegerField()
+    ), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_auto_20250422_1956'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Number of comments'),
+        ),
+        migrations.RunPython(fill_comment_count, migrations.RunPython.noop),
+    ]
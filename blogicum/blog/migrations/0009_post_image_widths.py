@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-18 18:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_widths',
+            field=models.CharField(blank=True, editable=False, max_length=64, verbose_name='Widths of resized image copies'),
+        ),
+    ]
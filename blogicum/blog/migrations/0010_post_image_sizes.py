@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-18 19:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0009_post_image_widths'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_sizes',
+            field=models.JSONField(default=dict, editable=False, verbose_name='Photo size before and after optimization, bytes'),
+        ),
+    ]
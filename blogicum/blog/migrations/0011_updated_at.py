@@ -0,0 +1,45 @@
+# Generated by Django 3.2.16 on 2026-10-18 19:18
+
+import blog.models
+from django.db import migrations, models
+
+MODELS = ('Category', 'Comment', 'Location', 'Post')
+
+
+def fill_updated_at(apps, schema_editor):
+    # Nothing is known about earlier edits; adding the column stamped
+    # every row with the time of the migration instead.
+    for name in MODELS:
+        apps.get_model('blog', name).objects.update(
+            updated_at=models.F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_post_image_sizes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='updated_at',
+            field=blog.models.ModificationTimeField(auto_now=True, db_index=True, verbose_name='Changed'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='updated_at',
+            field=blog.models.ModificationTimeField(auto_now=True, db_index=True, verbose_name='Changed'),
+        ),
+        migrations.AddField(
+            model_name='location',
+            name='updated_at',
+            field=blog.models.ModificationTimeField(auto_now=True, db_index=True, verbose_name='Changed'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='updated_at',
+            field=blog.models.ModificationTimeField(auto_now=True, db_index=True, verbose_name='Changed'),
+        ),
+        migrations.RunPython(fill_updated_at, migrations.RunPython.noop),
+    ]
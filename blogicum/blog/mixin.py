@@ -1,8 +1,41 @@
-from django.shortcuts import get_object_or_404, redirect
+from hashlib import md5
+from typing import Dict, Iterable, Optional
+
+from django.core.paginator import InvalidPage
+from django.http import Http404, HttpResponse
+from django.middleware.csrf import get_token
+from django.shortcuts import redirect
 from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+from blogicum.instrumentation import measure
+from blogicum.routers import iter_from_replica, reading_from_replica
 
+from . import cache as feed_cache
+from .decorators import memoize_per_request
 from .forms import CommentModelForm, PostModelForm
 from .models import Comment, Post
+from .paginators import CachedCountPaginator, FEED_ORDERING, KeysetPaginator
+
+
+class ReplicaReadMixin:
+    """Read from the replica database, see ``blogicum.routers``.
+
+    Templates evaluate the querysets they are given, so the response is
+    rendered before the replica is let go.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        with reading_from_replica(request):
+            response = super().dispatch(request, *args, **kwargs)
+            if hasattr(response, 'render') and not response.is_rendered:
+                with measure('render'):
+                    response.render()
+        if response.streaming:
+            response.streaming_content = iter_from_replica(
+                request, response.streaming_content)
+        return response
 
 
 class GetPostDetailUrlMixin:
@@ -12,32 +45,189 @@ class GetPostDetailUrlMixin:
                        args=[self.kwargs['post_id']])
 
 
-class CommentModificationPermissionMixin(GetPostDetailUrlMixin):
+class AnonymousFeedCacheMixin:
+    """Serve rendered pages to anonymous visitors from the feed cache.
+
+    Needs ``KeysetPaginationMixin``. Only the query parameters the page is
+    built from go into the cache key, so made-up ones neither fill the
+    cache nor skip it.
+    """
+
+    cache_header = 'X-Feed-Cache'
+
+    def get_cache_query(self) -> Dict[str, str]:
+        query = self.request.GET
+        return {name: query[name]
+                for name in (self.cursor_kwarg, self.page_kwarg)
+                if name in query}
+
+    def get(self, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return super().get(request, *args, **kwargs)
+        key = feed_cache.make_page_key(request.resolver_match.view_name,
+                                       [str(value) for value in
+                                        kwargs.values()],
+                                       self.get_cache_query())
+        page = feed_cache.get_page(key)
+        if page is not None:
+            content, etag = page
+            response = None
+            if etag:
+                response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = HttpResponse(content)
+            if etag:
+                response['ETag'] = etag
+            response[self.cache_header] = 'HIT'
+            return response
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == 200:
+            response.add_post_render_callback(
+                lambda rendered: feed_cache.set_page(
+                    key, rendered.content, rendered.get('ETag')))
+        response[self.cache_header] = 'MISS'
+        return response
+
+
+class ConditionalGetMixin:
+    """Answer ``304 Not Modified`` before the page is built.
+
+    ``get_validator()`` reads, with one cheap query, values that change
+    whenever the page would. The ETag also covers who is looking, as
+    pages differ for the author and for everyone else, and the session and
+    CSRF cookie, so a page cached before a new login never comes back with
+    the forms of the old one.
+    """
+
+    def get_validator(self) -> Optional[Iterable]:
+        """Return ``None`` to skip the check."""
+        raise NotImplementedError
+
+    def get_visitor(self) -> tuple:
+        request = self.request
+        if not request.user.is_authenticated:
+            return (None,)
+        # Sets the CSRF cookie now if the visitor has none yet, so the
+        # response that carries it also carries this ETag.
+        get_token(request)
+        return (request.user.pk, request.session.session_key,
+                request.META['CSRF_COOKIE'])
+
+    def get_etag(self) -> Optional[str]:
+        validator = self.get_validator()
+        if validator is None:
+            return None
+        stamp = repr((*self.get_visitor(), *validator))
+        return quote_etag(md5(stamp.encode()).hexdigest())
+
+    def get(self, request, *args, **kwargs):
+        etag = self.get_etag()
+        if etag is None:
+            return super().get(request, *args, **kwargs)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+        return response
+
+
+class PostListValidatorMixin(ConditionalGetMixin):
+    """Validate a list page by the rows of its own keyset window.
+
+    The window is read as the page is, so a 304 costs one query bounded by
+    the page size however long the list is. A post added, edited, deleted
+    or going live inside the window changes its rows or its cursors. Needs
+    ``KeysetPaginationMixin``; legacy offset pages are not validated.
+    """
+
+    def get_validator(self):
+        if self.page_kwarg in self.request.GET:
+            return None
+        queryset = (self.get_queryset()
+                    .select_related(None)
+                    .select_related('category', 'location')
+                    .only('pub_date', 'updated_at', 'category__updated_at',
+                          'location__updated_at'))
+        paginator = self.keyset_paginator_class(
+            queryset, self.get_paginate_by(queryset), self.keyset_ordering)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidPage:
+            return None
+        return (page.previous_cursor, page.next_cursor, *(
+            (post.id, post.updated_at,
+             post.category and post.category.updated_at,
+             post.location and post.location.updated_at)
+            for post in page))
+
+
+class KeysetPaginationMixin:
+    """Paginate a ListView by cursor instead of page number.
+
+    Legacy ``?page=N`` links still go through the offset paginator, which
+    caches its total under the key from ``get_count_key()``.
+    """
+
+    keyset_paginator_class = KeysetPaginator
+    keyset_ordering = FEED_ORDERING
+    paginator_class = CachedCountPaginator
+    cursor_kwarg = 'cursor'
+
+    def get_count_key(self):
+        return feed_cache.make_count_key(
+            self.request.resolver_match.view_name,
+            [str(value) for value in self.kwargs.values()])
+
+    def get_paginator(self, *args, **kwargs):
+        return super().get_paginator(*args, count_key=self.get_count_key(),
+                                     **kwargs)
+
+    def paginate_queryset(self, queryset, page_size):
+        if self.page_kwarg in self.request.GET:
+            return super().paginate_queryset(queryset, page_size)
+        paginator = self.keyset_paginator_class(queryset, page_size,
+                                                self.keyset_ordering)
+        try:
+            page = paginator.page(self.request.GET.get(self.cursor_kwarg))
+        except InvalidPage as error:
+            raise Http404(str(error))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class AuthorPermissionMixin(GetPostDetailUrlMixin):
+    """Let only the author modify the object, fetching it once."""
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.get_object().author_id != request.user.id:
+            return redirect(self.get_success_url(), permanent=True)
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_object(self, queryset=None):
+        if queryset is None:
+            return self._get_checked_object()
+        return super().get_object(queryset)
+
+    @memoize_per_request
+    def _get_checked_object(self):
+        return super().get_object()
+
+
+class CommentModificationPermissionMixin(AuthorPermissionMixin):
     model = Comment
     form_class = CommentModelForm
     template_name = 'blog/comment.html'
     pk_url_kwarg = 'comment_id'
     slug_url_kwarg = 'post_id'
-
-    def dispatch(self, request, *args, **kwargs):
-        comment = get_object_or_404(Comment,
-                                    id=kwargs['comment_id'],
-                                    post_id=kwargs['post_id'])
-        if request.user != comment.author:
-            return redirect(self.get_success_url(), permanent=True)
-        return super().dispatch(request, *args, **kwargs)
+    slug_field = 'post_id'
+    query_pk_and_slug = True
 
 
-class PostModificationPermissionMixin(GetPostDetailUrlMixin):
+class PostModificationPermissionMixin(AuthorPermissionMixin):
     model = Post
     pk_url_kwarg = 'post_id'
     template_name = 'blog/create.html'
     form_class = PostModelForm
 
-    def dispatch(self, request, *args, **kwargs):
-        author = self.get_object().author
-        auth_user = request.user
-        if auth_user != author:
-            return redirect(self.get_success_url(),
-                            permanent=True)
-        return super().dispatch(request, *args, **kwargs)
+    def get_queryset(self):
+        return super().get_queryset().select_related('location')
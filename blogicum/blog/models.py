@@ -6,20 +6,48 @@ from django.db.models import (
     DateTimeField,
     ForeignKey,
     ImageField,
+    Index,
+    JSONField,
     Model,
+    PositiveIntegerField,
+    Q,
+    QuerySet,
     SlugField,
     SET_NULL,
     TextField,
 )
+from django.utils import timezone
 
 from .decorators import cut_str
 
 MAX_LENGTH_CHARS = 256
+# Written by process_post_image once a photo is uploaded.
+IMAGE_JOB_FIELDS = ('image', 'image_widths', 'image_sizes')
+
+
+class ModificationTimeField(DateTimeField):
+    """Indexed time of the latest change, set on every save."""
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('auto_now', True)
+        kwargs.setdefault('db_index', True)
+        super().__init__(*args, **kwargs)
+
+
+class TimestampedQuerySet(QuerySet):
+
+    def update(self, **kwargs):
+        # Bulk updates skip save(), so auto_now would not apply.
+        kwargs.setdefault('updated_at', timezone.now())
+        return super().update(**kwargs)
 
 
 class CreatedModel(Model):
     created_at = DateTimeField(auto_now_add=True,
                                verbose_name='Added')
+    updated_at = ModificationTimeField(verbose_name='Changed')
+
+    objects = TimestampedQuerySet.as_manager()
 
     class Meta:
         abstract = True
@@ -102,16 +130,71 @@ class Post(PublishedCreatedModel):
         null=True,
         verbose_name='Category'
     )
+    image_widths = CharField(
+        max_length=64,
+        blank=True,
+        editable=False,
+        verbose_name='Widths of resized image copies'
+    )
+    image_sizes = JSONField(
+        default=dict,
+        editable=False,
+        verbose_name='Photo size before and after optimization, bytes'
+    )
+    comment_count = PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Number of comments'
+    )
 
     class Meta:
         ordering = ('-pub_date',)
         verbose_name = 'Publication'
         verbose_name_plural = 'Publication'
+        indexes = (
+            Index(fields=('pub_date',),
+                  condition=Q(is_published=True),
+                  name='post_published_feed_idx'),
+            Index(fields=('category', 'pub_date'),
+                  condition=Q(is_published=True),
+                  name='post_category_feed_idx'),
+            Index(fields=('author', 'pub_date'),
+                  name='post_author_feed_idx'),
+        )
 
     @cut_str
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        post = super().from_db(db, field_names, values)
+        if 'image' in field_names:
+            post._loaded_image = values[field_names.index('image')]
+        return post
+
+    def _image_replaced(self) -> bool:
+        return (not self.image._committed
+                or self.image.name != getattr(self, '_loaded_image',
+                                              self.image.name))
+
+    def save(self, *args, **kwargs):
+        if (self.pk is not None and not self._state.adding
+                and kwargs.get('update_fields') is None):
+            # comment_count is only changed by atomic F() updates and the
+            # photo fields by process_post_image, unless a new photo is
+            # uploaded; writing back the values loaded with the instance
+            # would undo them.
+            skipped = {'comment_count'}
+            if not self._image_replaced():
+                skipped.update(IMAGE_JOB_FIELDS)
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in skipped
+            ]
+        super().save(*args, **kwargs)
+        self._loaded_image = self.image.name
+
 
 class Comment(CreatedModel):
     text = TextField(verbose_name='Text')
@@ -127,6 +210,10 @@ class Comment(CreatedModel):
     class Meta:
         ordering = ('created_at',)
         verbose_name = 'comment'
+        indexes = (
+            Index(fields=('post', 'created_at'),
+                  name='comment_post_created_idx'),
+        )
 
     @cut_str
     def __str__(self):
@@ -0,0 +1,169 @@
+import json
+from collections.abc import Sequence
+from typing import Iterable, List, Optional, Tuple
+
+from django.core.paginator import InvalidPage, Page, Paginator
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+from django.utils.encoding import force_str
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+
+from .cache import get_count, set_count
+
+FEED_ORDERING = ('-pub_date', '-id')
+COMMENT_ORDERING = ('created_at', 'id')
+NEXT = 'n'
+PREVIOUS = 'p'
+PAGES_ON_EACH_SIDE = 2
+PAGES_ON_ENDS = 1
+
+
+class KeysetPage(Sequence):
+    """One window of a keyset-paginated queryset."""
+
+    def __init__(self, object_list: List, paginator: 'KeysetPaginator',
+                 next_cursor: Optional[str],
+                 previous_cursor: Optional[str]):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f'<Keyset page of {len(self)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """Paginate a queryset by seeking past the last seen ordering key.
+
+    Unlike ``django.core.paginator.Paginator`` no ``COUNT(*)`` and no
+    ``OFFSET`` are issued, so every page costs the same as the first one.
+    The ordering must end with a unique field (``id`` by default).
+    """
+
+    cursor_based = True
+
+    def __init__(self, object_list: QuerySet, per_page: int,
+                 ordering: Iterable[str] = FEED_ORDERING):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.fields = tuple(name.lstrip('-') for name in self.ordering)
+
+    def page(self, cursor: Optional[str] = None) -> KeysetPage:
+        if not cursor:
+            return self._build_page(NEXT, None)
+        direction, values = self.decode_cursor(cursor)
+        return self._build_page(direction, values)
+
+    def encode_cursor(self, direction: str, obj) -> str:
+        values = [force_str(getattr(obj, name)) for name in self.fields]
+        payload = json.dumps([direction, values], separators=(',', ':'))
+        return urlsafe_base64_encode(payload.encode())
+
+    def decode_cursor(self, cursor: str) -> Tuple[str, List]:
+        try:
+            direction, raw_values = json.loads(
+                urlsafe_base64_decode(cursor))
+            if (direction not in (NEXT, PREVIOUS)
+                    or len(raw_values) != len(self.fields)):
+                raise ValueError
+            model_meta = self.object_list.model._meta
+            values = [model_meta.get_field(name).to_python(value)
+                      for name, value in zip(self.fields, raw_values)]
+        except Exception:
+            raise InvalidPage('Invalid cursor')
+        return direction, values
+
+    def _seek_filter(self, values: List, backwards: bool) -> Q:
+        """Build ``(a, b) < (x, y)`` as ``a < x OR (a = x AND b < y)``."""
+        seek = Q()
+        for position, name in enumerate(self.ordering):
+            descending = name.startswith('-')
+            lookup = 'gt' if descending == backwards else 'lt'
+            field = self.fields[position]
+            condition = Q(**{f'{field}__{lookup}': values[position]})
+            for previous_field, value in zip(self.fields, values[:position]):
+                condition &= Q(**{previous_field: value})
+            seek |= condition
+        return seek
+
+    def _build_page(self, direction: str,
+                    values: Optional[List]) -> KeysetPage:
+        backwards = direction == PREVIOUS
+        ordering = self.ordering
+        queryset = self.object_list
+        if backwards:
+            ordering = tuple(name[1:] if name.startswith('-') else f'-{name}'
+                             for name in ordering)
+        if values is not None:
+            queryset = queryset.filter(self._seek_filter(values, backwards))
+        rows = list(queryset.order_by(*ordering)[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        if backwards and not has_more:
+            # Walked back to the head of the list: serve the real first page
+            # so it is never shorter than ``per_page``.
+            return self._build_page(NEXT, None)
+        rows = rows[:self.per_page]
+        if backwards:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, values is not None
+        next_cursor = previous_cursor = None
+        if rows and has_next:
+            next_cursor = self.encode_cursor(NEXT, rows[-1])
+        if rows and has_previous:
+            previous_cursor = self.encode_cursor(PREVIOUS, rows[0])
+        return KeysetPage(rows, self, next_cursor, previous_cursor)
+
+
+class ElidedPage(Page):
+
+    @property
+    def elided_page_range(self):
+        return self.paginator.get_elided_page_range(
+            self.number,
+            on_each_side=PAGES_ON_EACH_SIDE,
+            on_ends=PAGES_ON_ENDS
+        )
+
+
+class CachedCountPaginator(Paginator):
+    """Offset paginator whose total is cached under ``count_key``.
+
+    The cached total is dropped together with the feed cache, so it is
+    refreshed whenever a post changes or a scheduled post goes live.
+    """
+
+    def __init__(self, *args, count_key: Optional[str] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_key = count_key
+
+    @cached_property
+    def count(self):
+        if self.count_key is None:
+            return super().count
+        total = get_count(self.count_key)
+        if total is None:
+            total = super().count
+            set_count(self.count_key, total)
+        return total
+
+    def _get_page(self, *args, **kwargs):
+        return ElidedPage(*args, **kwargs)
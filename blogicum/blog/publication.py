@@ -0,0 +1,50 @@
+"""Scheduled publication boundary.
+
+Posts with ``pub_date`` in the future become visible on their own, with no
+write to the database. Everything that caches visible posts (rendered feed
+pages, feeds) asks this module how long the cached data stays valid: until
+the next scheduled ``pub_date`` passes.
+"""
+from datetime import datetime
+from math import ceil
+from typing import Optional
+
+from django.core.cache import cache
+from django.db.models import Min
+from django.utils import timezone
+
+from .models import Post
+
+NEXT_PUBLICATION_KEY = 'blog:next_publication'
+NEXT_PUBLICATION_TIMEOUT = 60
+NO_SCHEDULED_POSTS = 'none'
+
+
+def get_next_publication() -> Optional[datetime]:
+    """Return the earliest future ``pub_date`` of a published post."""
+    now = timezone.now()
+    boundary = cache.get(NEXT_PUBLICATION_KEY)
+    if boundary is None or (boundary != NO_SCHEDULED_POSTS
+                            and boundary <= now):
+        boundary = (Post.objects
+                    .filter(is_published=True, pub_date__gt=now)
+                    .aggregate(boundary=Min('pub_date'))['boundary']
+                    or NO_SCHEDULED_POSTS)
+        cache.set(NEXT_PUBLICATION_KEY, boundary,
+                  timeout=NEXT_PUBLICATION_TIMEOUT)
+    if boundary == NO_SCHEDULED_POSTS:
+        return None
+    return boundary
+
+
+def seconds_until_next_publication(limit: int) -> int:
+    """Time a snapshot of visible posts stays valid, capped by ``limit``."""
+    boundary = get_next_publication()
+    if boundary is None:
+        return limit
+    remaining = ceil((boundary - timezone.now()).total_seconds())
+    return max(0, min(limit, remaining))
+
+
+def reset_next_publication():
+    cache.delete(NEXT_PUBLICATION_KEY)
@@ -0,0 +1,162 @@
+"""XML sitemaps of visible posts, categories and authors.
+
+Posts are split into sitemaps of at most ``POSTS_PER_SITEMAP`` URLs by id,
+so a post always stays in the same sitemap and no ``OFFSET`` is needed to
+find a chunk. A URL's ``lastmod`` is the later of when its post went live
+and when it last changed. Every sitemap is generated row by row from
+``values_list()`` iterators and is streamed, or written to a file by
+``render_sitemaps``, as it is produced.
+"""
+from itertools import chain
+from typing import Callable, Iterable, Iterator, List, Tuple
+from xml.sax.saxutils import escape
+
+from django.db.models import DateTimeField, F, Max
+from django.db.models.functions import Greatest
+from django.http import Http404, StreamingHttpResponse
+from django.urls import reverse
+from django.views import View
+
+from .mixin import ReplicaReadMixin
+from .models import Post
+from .utils import published_posts_filter
+
+POSTS_PER_SITEMAP = 50000
+ITERATOR_CHUNK_SIZE = 2000
+SECTIONS = ('categories', 'profiles')
+URLSET_START = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<urlset xmlns="http://www.sitemaps.org/schemas/'
+                'sitemap/0.9">\n')
+URLSET_END = '</urlset>\n'
+INDEX_START = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+               '<sitemapindex xmlns="http://www.sitemaps.org/schemas/'
+               'sitemap/0.9">\n')
+INDEX_END = '</sitemapindex>\n'
+
+# Turns a path into an absolute URL.
+Absolute = Callable[[str], str]
+
+
+def _entry(tag: str, location: str, lastmod) -> str:
+    lastmod = (f'<lastmod>{lastmod.date().isoformat()}</lastmod>'
+               if lastmod else '')
+    return f'<{tag}><loc>{escape(location)}</loc>{lastmod}</{tag}>\n'
+
+
+def _visible_posts():
+    return (Post.objects
+            .filter(published_posts_filter())
+            .annotate(lastmod=Greatest(
+                'pub_date', 'updated_at', output_field=DateTimeField()))
+            .order_by())
+
+
+def get_post_chunks() -> List[Tuple[int, object]]:
+    """Numbers of the non-empty post sitemaps and their newest dates."""
+    return list(_visible_posts()
+                .annotate(chunk=(F('id') - 1) / POSTS_PER_SITEMAP + 1)
+                .values_list('chunk')
+                .annotate(chunk_lastmod=Max('lastmod'))
+                .order_by('chunk'))
+
+
+def iter_index(absolute: Absolute) -> Iterator[str]:
+    yield INDEX_START
+    for chunk, lastmod in get_post_chunks():
+        yield _entry('sitemap',
+                     absolute(reverse('blog:sitemap_posts', args=[chunk])),
+                     lastmod)
+    for section in SECTIONS:
+        yield _entry('sitemap',
+                     absolute(reverse('blog:sitemap', args=[section])),
+                     None)
+    yield INDEX_END
+
+
+def iter_post_urls(chunk: int, absolute: Absolute) -> Iterator[str]:
+    first_id = (chunk - 1) * POSTS_PER_SITEMAP + 1
+    posts = (_visible_posts()
+             .filter(id__gte=first_id,
+                     id__lt=first_id + POSTS_PER_SITEMAP)
+             .order_by('id')
+             .values_list('id', 'lastmod'))
+    for post_id, lastmod in posts.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        yield _entry('url',
+                     absolute(reverse('blog:post_detail', args=[post_id])),
+                     lastmod)
+
+
+def _iter_grouped_urls(field: str, view_name: str,
+                       absolute: Absolute) -> Iterator[str]:
+    """Yield URLs of ``field`` values having visible posts.
+
+    Each URL is dated by the newest of those posts.
+    """
+    rows = (_visible_posts()
+            .values_list(field)
+            .annotate(newest=Max('lastmod'))
+            .order_by(field))
+    for value, lastmod in rows.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        yield _entry('url', absolute(reverse(view_name, args=[value])),
+                     lastmod)
+
+
+def iter_section_urls(section: str, absolute: Absolute) -> Iterator[str]:
+    if section == 'categories':
+        return _iter_grouped_urls('category__slug', 'blog:category_posts',
+                                  absolute)
+    if section == 'profiles':
+        return _iter_grouped_urls('author__username', 'blog:profile',
+                                  absolute)
+    raise LookupError(f'Unknown sitemap section {section}')
+
+
+def urlset(urls: Iterable[str]) -> Iterator[str]:
+    yield URLSET_START
+    yield from urls
+    yield URLSET_END
+
+
+def encode_chunks(lines: Iterable[str],
+                  size: int = ITERATOR_CHUNK_SIZE) -> Iterator[bytes]:
+    """Join ``size`` lines at a time so each write is worth making."""
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) == size:
+            yield ''.join(batch).encode()
+            batch.clear()
+    if batch:
+        yield ''.join(batch).encode()
+
+
+class SitemapView(ReplicaReadMixin, View):
+    """Stream the sitemap of ``section``, or the index without one."""
+
+    content_type = 'application/xml'
+
+    def get_lines(self) -> Iterator[str]:
+        absolute = self.request.build_absolute_uri
+        section = self.kwargs.get('section')
+        if section is None:
+            return iter_index(absolute)
+        if section not in SECTIONS:
+            raise Http404('Unknown sitemap')
+        return urlset(iter_section_urls(section, absolute))
+
+    def get(self, request, *args, **kwargs):
+        return StreamingHttpResponse(encode_chunks(self.get_lines()),
+                                     content_type=self.content_type)
+
+
+class PostSitemapView(SitemapView):
+
+    def get_lines(self):
+        urls = iter_post_urls(self.kwargs['chunk'],
+                              self.request.build_absolute_uri)
+        # Read the first row now: the response cannot turn into a 404 once
+        # it is streaming.
+        first = next(urls, None)
+        if first is None:
+            raise Http404('No such sitemap')
+        return urlset(chain((first,), urls))
@@ -0,0 +1,35 @@
+from functools import partial
+
+from django.db import transaction
+
+from jobs.registry import task
+
+from .cache import invalidate_feed_cache
+from .images import delete_image, generate_renditions, optimize_image
+from .models import Post
+
+
+@task
+def process_post_image(post_id: int):
+    post = Post.objects.filter(pk=post_id).only('image').first()
+    if post is None or not post.image:
+        return
+    storage = post.image.storage
+    uploaded_name = post.image.name
+    original_size, size = optimize_image(post.image)
+    widths = generate_renditions(post.image)
+    # The filter skips the update if another photo was uploaded meanwhile.
+    updated = Post.objects.filter(pk=post_id, image=uploaded_name).update(
+        image=post.image.name, image_widths=widths,
+        image_sizes={'original': original_size, 'optimized': size})
+    renamed = post.image.name != uploaded_name
+    if not updated:
+        if renamed:
+            delete_image(storage, post.image.name, widths)
+        return
+    if renamed:
+        # Until the row points at the new file, a retry starts over from
+        # the uploaded one.
+        transaction.on_commit(partial(storage.delete, uploaded_name))
+    # Cached pages still point at the file as it was uploaded.
+    invalidate_feed_cache()
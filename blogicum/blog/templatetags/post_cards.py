@@ -0,0 +1,12 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from blog.cache import get_post_cards
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_cards(posts):
+    """Usage: ``{% post_cards page_obj as cards %}``."""
+    return [mark_safe(card) for card in get_post_cards(list(posts))]
@@ -0,0 +1,25 @@
+from django import template
+
+from blog.images import CARD_WIDTHS, RENDITION_WIDTHS, get_renditions
+
+register = template.Library()
+
+MAX_WIDTHS = {
+    'card': max(CARD_WIDTHS),
+    'detail': max(RENDITION_WIDTHS),
+}
+# Cards and the post page are both at most 40rem wide.
+SIZES = '(max-width: 640px) 100vw, 640px'
+
+
+@register.inclusion_tag('includes/post_image.html')
+def post_image(post, size='card'):
+    """Usage: ``{% post_image post 'detail' %}``."""
+    renditions = get_renditions(post.image, post.image_widths,
+                                MAX_WIDTHS[size])
+    return {
+        'post': post,
+        'src': renditions[-1][0] if renditions else post.image.url,
+        'srcset': ', '.join(f'{url} {width}w' for url, width in renditions),
+        'sizes': SIZES,
+    }
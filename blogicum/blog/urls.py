@@ -1,6 +1,6 @@
 from django.urls import include, path
 
-from . import views
+from . import feeds, sitemaps, views
 
 
 app_name = 'blog'
@@ -9,6 +9,8 @@ app_name = 'blog'
 profile_urls = [
     path('<str:username>/',
          views.ProfileDetailView.as_view(), name='profile'),
+    path('<str:username>/feed/<str:feed_format>/',
+         feeds.ProfileFeedView.as_view(), name='profile_feed'),
     path('current/edit/',
          views.ProfileUpdateView.as_view(), name='edit_profile'),
 ]
@@ -22,6 +24,8 @@ posts_urls = [
          views.PostUpdateView.as_view(), name='edit_post'),
     path('<int:post_id>/',
          views.PostDetailView.as_view(), name='post_detail'),
+    path('<int:post_id>/comments/',
+         views.PostCommentsView.as_view(), name='post_comments'),
     path('<int:post_id>/comment/',
          views.CommentCreateView.as_view(), name='add_comment'),
     path('<int:post_id>/edit_comment/<int:comment_id>/',
@@ -33,10 +37,20 @@ posts_urls = [
 category_urls = [
     path('<slug:category_slug>/',
          views.CategoryDetailView.as_view(), name='category_posts'),
+    path('<slug:category_slug>/feed/<str:feed_format>/',
+         feeds.CategoryFeedView.as_view(), name='category_feed'),
 ]
 
 urlpatterns = [
     path('', views.PostListView.as_view(), name='index'),
+    path('feed/<str:feed_format>/',
+         feeds.PostFeedView.as_view(), name='feed'),
+    path('sitemap.xml',
+         sitemaps.SitemapView.as_view(), name='sitemap_index'),
+    path('sitemap-posts-<int:chunk>.xml',
+         sitemaps.PostSitemapView.as_view(), name='sitemap_posts'),
+    path('sitemap-<str:section>.xml',
+         sitemaps.SitemapView.as_view(), name='sitemap'),
     path('profile/', include(profile_urls)),
     path('posts/', include(posts_urls)),
     path('category/', include(category_urls)),
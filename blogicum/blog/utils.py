@@ -1,19 +1,26 @@
-from django.db.models import Count, QuerySet
+from django.db.models import Q, QuerySet
 from django.utils import timezone
 
 from .models import Post
 
 
-def get_posts(to_filter: bool = False,
-              count_comments: bool = False) -> QuerySet:
+def published_posts_filter() -> Q:
+    """Posts visible to everyone, not only to their authors."""
+    return Q(is_published=True,
+             pub_date__lte=timezone.now(),
+             category__is_published=True)
+
+
+def get_posts(to_filter: bool = False) -> QuerySet:
     posts = Post.objects.select_related('author', 'category', 'location')
     if to_filter:
-        posts = (posts
-                 .filter(is_published=True,
-                         pub_date__lte=timezone.now(),
-                         category__is_published=True))
-    if count_comments:
-        posts = (posts
-                 .annotate(comment_count=Count('comments'))
-                 .order_by("-pub_date"))
+        posts = posts.filter(published_posts_filter())
     return posts
+
+
+def visible_post_exists(post_id: int, user) -> bool:
+    """Whether ``user`` may see the post, checked without loading it."""
+    return (Post.objects
+            .filter(Q(author_id=user.id) | published_posts_filter(),
+                    pk=post_id)
+            .exists())
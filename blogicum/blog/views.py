@@ -1,5 +1,7 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import transaction
+from django.db.models import Max
 from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
@@ -12,36 +14,60 @@ from django.views.generic import (
     UpdateView,
 )
 
+from .decorators import memoize_per_request
 from .forms import CommentModelForm, PostModelForm
 from .models import Category, Comment, Post
 from .mixin import (
+    AnonymousFeedCacheMixin,
     CommentModificationPermissionMixin,
+    ConditionalGetMixin,
     GetPostDetailUrlMixin,
-    PostModificationPermissionMixin
+    KeysetPaginationMixin,
+    PostListValidatorMixin,
+    PostModificationPermissionMixin,
+    ReplicaReadMixin
 )
-from .utils import get_posts
+from .paginators import COMMENT_ORDERING, KeysetPaginator
+from .utils import get_posts, visible_post_exists
 
 User = get_user_model()
 POSTINPAGE = 10
+COMMENTSINPAGE = 50
 
 
-class ProfileDetailView(ListView):
+class ProfileDetailView(ReplicaReadMixin,
+                        PostListValidatorMixin,
+                        KeysetPaginationMixin,
+                        ListView):
     model = Post
     template_name = 'blog/profile.html'
     slug_field = 'username'
     slug_url_kwarg = 'username'
     paginate_by = POSTINPAGE
 
+    @memoize_per_request
     def get_author(self) -> User:
-
         return get_object_or_404(User, username=self.kwargs['username'])
 
     def get_queryset(self):
-        auth_user = self.request.user
+        return (get_posts(to_filter=not self.is_own_profile())
+                .filter(author=self.get_author()))
+
+    def is_own_profile(self) -> bool:
+        return self.get_author() == self.request.user
+
+    def get_count_key(self):
+        count_key = super().get_count_key()
+        return f'{count_key}:own' if self.is_own_profile() else count_key
+
+    def get_validator(self):
+        validator = super().get_validator()
+        if validator is None:
+            return None
+        # The profile card above the posts.
         author = self.get_author()
-        return (get_posts(to_filter=(author != auth_user),
-                          count_comments=True)
-                .filter(author=author))
+        return (author.get_full_name(), author.date_joined, author.is_staff,
+                *validator)
 
     def get_context_data(self, **kwargs):
         context_data = super().get_context_data(**kwargs)
@@ -97,19 +123,38 @@ class PostUpdateView(LoginRequiredMixin,
     pass
 
 
-class PostListView(ListView):
+class PostListView(ReplicaReadMixin,
+                   AnonymousFeedCacheMixin,
+                   PostListValidatorMixin,
+                   KeysetPaginationMixin,
+                   ListView):
     model = Post
     template_name = 'blog/index.html'
     paginate_by = POSTINPAGE
-    queryset = get_posts(to_filter=True,
-                         count_comments=True)
 
+    def get_queryset(self):
+        return get_posts(to_filter=True)
 
-class PostDetailView(DetailView):
-    queryset = get_posts()
+
+class PostDetailView(ReplicaReadMixin,
+                     ConditionalGetMixin,
+                     DetailView):
     template_name = 'blog/detail.html'
     pk_url_kwarg = 'post_id'
 
+    def get_queryset(self):
+        return get_posts()
+
+    def get_validator(self):
+        return (Post.objects
+                .filter(pk=self.kwargs[self.pk_url_kwarg])
+                .annotate(comment_changed=Max('comments__updated_at'))
+                .values_list('updated_at', 'category__updated_at',
+                             'location__updated_at', 'comment_changed',
+                             'author__username', 'author__first_name',
+                             'author__last_name')
+                .first())
+
     def get_object(self, queryset=None):
         post: Post = super().get_object(queryset)
         author = post.author
@@ -124,18 +169,52 @@ class PostDetailView(DetailView):
     def get_context_data(self, **kwargs):
         context_data = super().get_context_data(**kwargs)
         post = context_data['post']
-        context_data['comments'] = (Comment.objects.select_related('author')
-                                    .filter(post=post))
+        comments_page = KeysetPaginator(
+            Comment.objects.select_related('author').filter(post=post),
+            COMMENTSINPAGE,
+            COMMENT_ORDERING
+        ).page()
+        context_data['comments'] = comments_page.object_list
+        context_data['comments_page'] = comments_page
         context_data['form'] = CommentModelForm()
         return context_data
 
 
-class CategoryDetailView(ListView):
+class PostCommentsView(ReplicaReadMixin,
+                       KeysetPaginationMixin,
+                       ListView):
+    """Next batch of comments, loaded into the post page by script."""
+
+    template_name = 'includes/comment_list.html'
+    context_object_name = 'comments'
+    paginate_by = COMMENTSINPAGE
+    keyset_ordering = COMMENT_ORDERING
+
+    def get_queryset(self):
+        post_id = self.kwargs['post_id']
+        if not visible_post_exists(post_id, self.request.user):
+            raise Http404('Post not found')
+        return (Comment.objects.select_related('author')
+                .filter(post_id=post_id))
+
+    def get_context_data(self, **kwargs):
+        context_data = super().get_context_data(**kwargs)
+        context_data['comments_page'] = context_data['page_obj']
+        context_data['post_id'] = self.kwargs['post_id']
+        return context_data
+
+
+class CategoryDetailView(ReplicaReadMixin,
+                         AnonymousFeedCacheMixin,
+                         PostListValidatorMixin,
+                         KeysetPaginationMixin,
+                         ListView):
     model = Category
     template_name = 'blog/category.html'
     slug_url_kwarg = 'category_slug'
     paginate_by = POSTINPAGE
 
+    @memoize_per_request
     def get_category(self):
         return get_object_or_404(Category,
                                  slug=self.kwargs[self.slug_url_kwarg],
@@ -143,10 +222,16 @@ class CategoryDetailView(ListView):
 
     def get_queryset(self):
         category = self.get_category()
-        return (get_posts(to_filter=True,
-                          count_comments=True)
+        return (get_posts(to_filter=True)
                 .filter(category=category))
 
+    def get_validator(self):
+        validator = super().get_validator()
+        if validator is None:
+            return None
+        # The title and description above the posts.
+        return (self.get_category().updated_at, *validator)
+
     def get_context_data(self, **kwargs):
         context_data = super().get_context_data(**kwargs)
         category = self.get_category()
@@ -164,12 +249,14 @@ class CommentCreateView(LoginRequiredMixin,
     slug_url_kwarg = 'post_id'
 
     def form_valid(self, form):
-        post = get_object_or_404(Post,
-                                 id=self.kwargs[self.slug_field])
+        post_id = self.kwargs[self.slug_url_kwarg]
         auth_user = self.request.user
-        form.instance.post = post
+        if not visible_post_exists(post_id, auth_user):
+            raise Http404('Post not found')
+        form.instance.post_id = post_id
         form.instance.author = auth_user
-        return super().form_valid(form)
+        with transaction.atomic():
+            return super().form_valid(form)
 
 
 class CommentUpdateView(LoginRequiredMixin,
@@ -0,0 +1,32 @@
+"""Counters of the database connections this process opened and reused."""
+import threading
+from collections import Counter
+from typing import Dict
+
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+COUNTERS = ('opened', 'reused', 'discarded')
+
+_lock = threading.Lock()
+_counters = Counter()
+
+
+def count(name: str):
+    with _lock:
+        _counters[name] += 1
+
+
+def get_stats() -> Dict[str, int]:
+    with _lock:
+        return {name: _counters[name] for name in COUNTERS}
+
+
+def reset_stats():
+    with _lock:
+        _counters.clear()
+
+
+@receiver(connection_created)
+def count_opened(sender, connection, **kwargs):
+    count('opened')
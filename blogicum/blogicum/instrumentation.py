@@ -0,0 +1,65 @@
+"""Timings of the request being served, collected for sampled requests.
+
+``InstrumentationMiddleware`` starts a ``RequestMetrics`` for a sampled
+request; code that wants a share of the request reported separately wraps
+it in ``measure()``, which costs nothing when the request is not sampled.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+
+class RequestMetrics:
+    __slots__ = ('started', 'sql_count', 'durations')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        # Seconds spent, by what they were spent on.
+        self.durations: Dict[str, float] = {'sql': 0.0}
+
+    def add(self, name: str, seconds: float):
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def time_query(self, execute, sql, params, many, context):
+        """``connection.execute_wrapper()`` callable timing every query."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_count += 1
+            self.durations['sql'] += time.perf_counter() - started
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+
+_current: ContextVar[Optional[RequestMetrics]] = ContextVar(
+    'request_metrics', default=None)
+
+
+def get_metrics() -> Optional[RequestMetrics]:
+    return _current.get()
+
+
+@contextmanager
+def collecting(metrics: RequestMetrics):
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def measure(name: str):
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add(name, time.perf_counter() - started)
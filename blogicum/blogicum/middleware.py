@@ -0,0 +1,111 @@
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.http.request import HttpRequest
+
+from . import dbstats
+from .instrumentation import RequestMetrics, collecting, get_metrics
+from .routers import pin_to_primary, replica_enabled
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+logger = logging.getLogger('blogicum.instrumentation')
+
+
+class ReplicaPinMiddleware:
+    """Pin a session to the default database after it writes."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest):
+        response = self.get_response(request)
+        if (replica_enabled() and request.method not in SAFE_METHODS
+                and response.status_code < 400
+                and hasattr(request, 'session')):
+            pin_to_primary(request)
+        return response
+
+
+class ConnectionHealthMiddleware:
+    """Check connections kept by ``CONN_MAX_AGE`` before they are reused.
+
+    Django only drops a kept connection once a query on it fails; this
+    replaces a broken one before the view runs. With ``DEBUG`` the
+    counters of ``blogicum.dbstats`` are sent as ``X-DB-Connections``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest):
+        for connection in connections.all():
+            if connection.connection is None:
+                continue
+            if connection.is_usable():
+                dbstats.count('reused')
+            else:
+                connection.close()
+                dbstats.count('discarded')
+        response = self.get_response(request)
+        if settings.DEBUG:
+            response['X-DB-Connections'] = ' '.join(
+                f'{name}={value}'
+                for name, value in dbstats.get_stats().items())
+        return response
+
+
+class InstrumentationMiddleware:
+    """Time a sample of requests: in total, in SQL and in templates.
+
+    A sampled request gets a ``Server-Timing`` header and a ``key=value``
+    line in the ``blogicum.instrumentation`` log. Queries are timed through
+    ``connection.execute_wrapper()``, so the request pays for it only when
+    sampled; ``INSTRUMENTATION_SAMPLE_RATE`` is the share sampled. Content
+    of streaming responses is produced after the middleware and is not
+    counted.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest):
+        if random.random() >= settings.INSTRUMENTATION_SAMPLE_RATE:
+            return self.get_response(request)
+        with ExitStack() as stack:
+            metrics = stack.enter_context(collecting(RequestMetrics()))
+            for connection in connections.all():
+                stack.enter_context(
+                    connection.execute_wrapper(metrics.time_query))
+            response = self.get_response(request)
+        self.report(request, response, metrics)
+        return response
+
+    def process_template_response(self, request, response):
+        metrics = get_metrics()
+        if metrics is not None:
+            started = time.perf_counter()
+            # Called right after rendering, or now if it is already done.
+            response.add_post_render_callback(lambda rendered: metrics.add(
+                'render', time.perf_counter() - started))
+        return response
+
+    def report(self, request, response, metrics: RequestMetrics):
+        durations = {'total': metrics.elapsed(), **metrics.durations}
+        response['Server-Timing'] = ', '.join(
+            f'{name};dur={seconds * 1000:.1f}'
+            + (f';desc="{metrics.sql_count} queries"'
+               if name == 'sql' else '')
+            for name, seconds in durations.items())
+        resolver_match = request.resolver_match
+        logger.info(
+            'method=%s path=%s view=%s status=%s sql_count=%s %s',
+            request.method, request.path,
+            resolver_match.view_name if resolver_match else '-',
+            response.status_code, metrics.sql_count,
+            ' '.join(f'{name}_ms={seconds * 1000:.1f}'
+                     for name, seconds in durations.items()))
@@ -0,0 +1,78 @@
+"""Send reads of read-only pages to a replica of the default database.
+
+The replica is used only when ``DATABASE_REPLICA`` configures it and only
+inside ``reading_from_replica()``, which views opt into. A session that has
+just written is pinned to the default database for ``REPLICA_PIN_SECONDS``,
+so the page it is redirected to shows what it wrote even before
+``replicate_db`` copies it.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterable, Iterator
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+REPLICA_ALIAS = 'replica'
+PIN_SESSION_KEY = '_replica_pinned_until'
+# Who the user is must never lag behind a login or a logout.
+PRIMARY_ONLY_APPS = frozenset({'auth', 'contenttypes', 'sessions', 'jobs'})
+
+_use_replica = ContextVar('use_replica', default=False)
+
+
+def replica_enabled() -> bool:
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+def pin_to_primary(request):
+    request.session[PIN_SESSION_KEY] = (time.time()
+                                        + settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned(request) -> bool:
+    session = getattr(request, 'session', None)
+    return (session is not None
+            and session.get(PIN_SESSION_KEY, 0) > time.time())
+
+
+@contextmanager
+def reading_from_replica(request):
+    token = _use_replica.set(replica_enabled() and not is_pinned(request))
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def iter_from_replica(request, chunks: Iterable) -> Iterator:
+    """Read from the replica while a streamed response is produced."""
+    chunks = iter(chunks)
+    while True:
+        with reading_from_replica(request):
+            try:
+                chunk = next(chunks)
+            except StopIteration:
+                return
+        yield chunk
+
+
+class PrimaryReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if (_use_replica.get()
+                and model._meta.app_label not in PRIMARY_ONLY_APPS):
+            return REPLICA_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both databases hold the same rows.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its tables from replicate_db.
+        return db == DEFAULT_DB_ALIAS
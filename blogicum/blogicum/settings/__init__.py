@@ -0,0 +1,10 @@
+"""Settings of the profile named by ``BLOGICUM_ENV``: dev (default) or prod.
+
+``DJANGO_SETTINGS_MODULE=blogicum.settings.prod`` selects one directly.
+"""
+import os
+
+if os.getenv('BLOGICUM_ENV', 'dev') == 'prod':
+    from .prod import *  # noqa: F401, F403
+else:
+    from .dev import *  # noqa: F401, F403
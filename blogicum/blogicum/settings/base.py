@@ -0,0 +1,204 @@
+import os
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+SECRET_KEY = os.getenv(
+    'DJANGO_SECRET_KEY',
+    'django-insecure-00auc+ypb2omvaedi14-^n0qvl3q%k$oighdo-2oocdk3ew4lw')
+
+CSRF_FAILURE_VIEW = 'pages.views.csrf_exception'
+
+EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+
+EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+
+MEDIA_ROOT = BASE_DIR / 'media'
+
+MEDIA_URL = '/media/'
+
+DEBUG = False
+
+ALLOWED_HOSTS = [
+    'localhost',
+    '127.0.0.1'
+]
+
+
+# Application definition
+
+INSTALLED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'django_bootstrap5',
+    'blog.apps.BlogConfig',
+    'pages.apps.PagesConfig',
+    'registration.apps.RegistrationConfig',
+    'jobs.apps.JobsConfig',
+    'search.apps.SearchConfig',
+]
+
+MIDDLEWARE = [
+    'blogicum.middleware.InstrumentationMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'blogicum.middleware.ConnectionHealthMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'blogicum.middleware.ReplicaPinMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'blogicum.urls'
+
+TEMPLATES_DIR = BASE_DIR / 'templates'
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [TEMPLATES_DIR],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'blogicum.wsgi.application'
+
+FEED_CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'blogicum-feed',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache' / 'feed',
+        # A card per post plus pages and counts; past this every write
+        # lists the directory and drops a third of it.
+        'OPTIONS': {'MAX_ENTRIES': int(
+            os.getenv('FEED_CACHE_MAX_ENTRIES', '100000'))},
+    },
+}
+
+# The default cache holds the feed cache generation and the next
+# publication boundary: a few keys that must not be culled with the pages.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'feed': FEED_CACHE_BACKENDS[os.getenv('FEED_CACHE_BACKEND', 'locmem')],
+}
+
+FEED_CACHE_TIMEOUT = 300
+
+POST_CARD_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Databases without FTS5 get search.backends.inverted.InvertedIndexBackend.
+SEARCH_BACKEND = 'search.backends.fts5.FTS5Backend'
+
+SEARCH_INDEX_DIR = BASE_DIR / 'search_index'
+
+# Where `render_sitemaps` writes the sitemaps for the web server.
+SITEMAPS_DIR = BASE_DIR / 'sitemaps'
+
+# Run queued jobs right away instead of leaving them to `runworker`.
+JOBS_RUN_INLINE = False
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'blogicum.sqlite',
+        'NAME': BASE_DIR / 'db.sqlite3',
+        # Seconds a thread keeps its connection between requests. The
+        # development server starts a thread per request, so only prod
+        # keeps them by default.
+        'CONN_MAX_AGE': int(os.getenv('CONN_MAX_AGE', '0')),
+        'OPTIONS': {
+            # Seconds to wait for another connection's write lock.
+            'timeout': float(os.getenv('SQLITE_BUSY_TIMEOUT', '5')),
+            'transaction_mode': 'IMMEDIATE',
+        },
+    }
+}
+
+# A copy of the default database for read-only pages, kept up to date by
+# `replicate_db`.
+if os.getenv('DATABASE_REPLICA'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.getenv('DATABASE_REPLICA'),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['blogicum.routers.PrimaryReplicaRouter']
+
+# How long a session reads from the default database after writing: more
+# than the replication lag.
+REPLICA_PIN_SECONDS = 15
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+LANGUAGE_CODE = 'en-us'
+
+LOGIN_URL = 'login'
+
+TIME_ZONE = 'UTC'
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+STATIC_URL = '/static/'
+
+STATICFILES_DIRS = [
+    BASE_DIR / 'static',
+]
+
+# Share of requests InstrumentationMiddleware times; 0 turns it off.
+INSTRUMENTATION_SAMPLE_RATE = float(
+    os.getenv('INSTRUMENTATION_SAMPLE_RATE', '1'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'blogicum.instrumentation': {
+            'handlers': ['console'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -0,0 +1,57 @@
+"""Settings for serving under load.
+
+Needs ``DJANGO_SECRET_KEY`` and ``DJANGO_ALLOWED_HOSTS`` (comma separated).
+Static files are served by the web server from ``STATIC_ROOT`` after
+``collectstatic``, media files from ``MEDIA_ROOT`` at ``MEDIA_URL``.
+Caches are files under ``BASE_DIR / 'cache'`` shared by all workers; a
+per-process ``FEED_CACHE_BACKEND=locmem`` is only safe with one worker.
+"""
+import os
+from pathlib import Path
+
+from .base import *  # noqa: F401, F403
+from .base import BASE_DIR, DATABASES, FEED_CACHE_BACKENDS, TEMPLATES
+
+DEBUG = False
+
+SECRET_KEY = os.environ['DJANGO_SECRET_KEY']
+
+ALLOWED_HOSTS = os.environ['DJANGO_ALLOWED_HOSTS'].split(',')
+
+for database in DATABASES.values():
+    database['CONN_MAX_AGE'] = int(os.getenv('CONN_MAX_AGE', '600'))
+
+# Invalidation and the next publication boundary must reach every worker.
+# The default cache keeps only a few keys, so it is never culled.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache' / 'default',
+    },
+    'feed': FEED_CACHE_BACKENDS[os.getenv('FEED_CACHE_BACKEND', 'file')],
+}
+
+# Templates are compiled once per process instead of on every render.
+TEMPLATES = [{
+    **TEMPLATES[0],
+    'APP_DIRS': False,
+    'OPTIONS': {
+        **TEMPLATES[0]['OPTIONS'],
+        'loaders': [
+            ('django.template.loaders.cached.Loader', [
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ]),
+        ],
+    },
+}]
+
+STATIC_ROOT = Path(os.getenv('DJANGO_STATIC_ROOT',
+                             BASE_DIR / 'static_root'))
+
+# Hashed file names, so the web server can let browsers cache them forever.
+STATICFILES_STORAGE = (
+    'django.contrib.staticfiles.storage.ManifestStaticFilesStorage')
+
+INSTRUMENTATION_SAMPLE_RATE = float(
+    os.getenv('INSTRUMENTATION_SAMPLE_RATE', '0.01'))
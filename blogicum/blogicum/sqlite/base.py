@@ -0,0 +1,94 @@
+"""SQLite backend for many concurrent readers and a few writers.
+
+Every new connection applies ``PRAGMAS``: WAL journaling lets readers go on
+while a comment is being written, instead of waiting for the writer. The
+backend accepts these ``OPTIONS`` besides those of ``sqlite3.connect()``:
+
+    pragmas           overrides of ``PRAGMAS``
+    transaction_mode  ``BEGIN`` mode of ``atomic()``; ``IMMEDIATE`` takes
+                      the write lock up front, so a transaction that read
+                      first cannot fail on its first write
+    lock_retries      times a ``BEGIN`` or a statement outside a transaction
+                      is tried again once the busy ``timeout`` runs out
+"""
+import time
+from typing import Callable
+
+from django.db.backends.sqlite3 import base
+
+PRAGMAS = {
+    'journal_mode': 'WAL',
+    # With WAL a power loss may lose the last commits, never integrity.
+    'synchronous': 'NORMAL',
+    # Negative sizes are in KiB: 20 MB of page cache per connection.
+    'cache_size': -20000,
+    'mmap_size': 256 * 1024 * 1024,
+    'temp_store': 'MEMORY',
+}
+BACKEND_OPTIONS = ('pragmas', 'transaction_mode', 'lock_retries')
+LOCK_RETRIES = 3
+# Doubled after every attempt.
+LOCK_RETRY_DELAY = 0.05
+
+
+def retry_when_locked(run: Callable, retries: int):
+    for attempt in range(retries + 1):
+        try:
+            return run()
+        except base.Database.OperationalError as error:
+            if attempt == retries or 'database is locked' not in str(error):
+                raise
+        time.sleep(LOCK_RETRY_DELAY * 2 ** attempt)
+
+
+class SQLiteCursorWrapper(base.SQLiteCursorWrapper):
+    lock_retries = LOCK_RETRIES
+
+    def execute(self, query, params=None):
+        execute = super().execute
+        if self.connection.in_transaction:
+            # Only the whole transaction could be run again.
+            return execute(query, params)
+        return retry_when_locked(lambda: execute(query, params),
+                                 self.lock_retries)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    @property
+    def backend_options(self):
+        return self.settings_dict['OPTIONS']
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        for name in BACKEND_OPTIONS:
+            params.pop(name, None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        pragmas = {**PRAGMAS, **self.backend_options.get('pragmas', {})}
+        retries = self.backend_options.get('lock_retries', LOCK_RETRIES)
+        for name, value in pragmas.items():
+            # Switching to WAL waits for other connections' transactions.
+            retry_when_locked(
+                lambda: connection.execute(f'PRAGMA {name} = {value}'),
+                retries)
+        return connection
+
+    def is_usable(self):
+        try:
+            self.connection.execute('SELECT 1')
+        except base.Database.Error:
+            return False
+        return True
+
+    def create_cursor(self, name=None):
+        cursor = self.connection.cursor(factory=SQLiteCursorWrapper)
+        cursor.lock_retries = self.backend_options.get('lock_retries',
+                                                       LOCK_RETRIES)
+        return cursor
+
+    def _start_transaction_under_autocommit(self):
+        mode = self.backend_options.get('transaction_mode')
+        self.cursor().execute(f'BEGIN {mode}' if mode else 'BEGIN')
@@ -1,21 +1,29 @@
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
+from django.contrib.auth.views import PasswordResetView
 from django.urls import path, include
 
+from registration.forms import QueuedPasswordResetForm
+
 handler404 = 'pages.views.page_not_found'
 handler500 = 'pages.views.server_error'
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('pages/', include('pages.urls')),
+    path('search/', include('search.urls')),
     path('auth/registration/', include('registration.urls')),
+    path('auth/password_reset/',
+         PasswordResetView.as_view(form_class=QueuedPasswordResetForm),
+         name='password_reset'),
     path('auth/', include('django.contrib.auth.urls')),
     path('', include('blog.urls')),
 ]
 
-if settings.DEBUG:
+if 'debug_toolbar' in settings.INSTALLED_APPS:
     import debug_toolbar
     urlpatterns += [path('__debug__/', include(debug_toolbar.urls))]
-    urlpatterns += static(
-        settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+
+# Only with DEBUG; in production the web server serves media files.
+urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,19 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        'task',
+        'status',
+        'attempts',
+        'run_after',
+        'locked_until',
+        'created_at',
+    )
+    list_filter = ('status', 'task')
+    readonly_fields = ('last_error',)
+
+
+admin.site.register(Job, JobAdmin)
@@ -0,0 +1,48 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from threading import Event
+
+from django.core.management.base import BaseCommand
+
+from jobs.worker import POLL_INTERVAL, VISIBILITY_TIMEOUT, work
+
+
+class Command(BaseCommand):
+    help = 'Run queued jobs until interrupted.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=1,
+                            help='Number of jobs to run concurrently.')
+        parser.add_argument('--once', action='store_true',
+                            help='Exit as soon as the queue is empty.')
+        parser.add_argument('--poll-interval', type=float,
+                            default=POLL_INTERVAL,
+                            help='Seconds to wait when the queue is empty.')
+        parser.add_argument('--visibility-timeout', type=int,
+                            default=VISIBILITY_TIMEOUT,
+                            help='Seconds before a job whose worker died '
+                                 'is handed to another worker.')
+
+    def handle(self, *args, threads: int, once: bool, poll_interval: float,
+               visibility_timeout: int, **options):
+        stop = Event()
+        run = partial(work, stop, poll_interval, visibility_timeout, once)
+        try:
+            if threads == 1:
+                processed = run()
+            else:
+                processed = self._run_in_threads(run, threads, stop)
+        except KeyboardInterrupt:
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f'Processed {processed} jobs.'))
+
+    @staticmethod
+    def _run_in_threads(run, threads: int, stop: Event) -> int:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            futures = [executor.submit(run) for _ in range(threads)]
+            try:
+                return sum(future.result() for future in futures)
+            finally:
+                # Let the other threads finish their current job and exit.
+                stop.set()
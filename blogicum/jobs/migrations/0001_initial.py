@@ -0,0 +1,39 @@
+# Generated by Django 3.2.16 on 2026-10-18 19:00
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task', models.CharField(max_length=256, verbose_name='Task')),
+                ('args', models.JSONField(default=list, verbose_name='Arguments')),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=16, verbose_name='Status')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Attempts made')),
+                ('max_attempts', models.PositiveSmallIntegerField(default=5, verbose_name='Attempts allowed')),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Not before')),
+                ('locked_until', models.DateTimeField(blank=True, null=True, verbose_name='Invisible to workers until')),
+                ('last_error', models.TextField(blank=True, verbose_name='Last error')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Added')),
+            ],
+            options={
+                'verbose_name': 'job',
+                'verbose_name_plural': 'Jobs',
+                'ordering': ('run_after', 'id'),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['status', 'run_after'], name='job_pending_idx'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+from django.db.models import (
+    CharField,
+    DateTimeField,
+    Index,
+    JSONField,
+    Model,
+    PositiveSmallIntegerField,
+    TextChoices,
+    TextField,
+)
+from django.utils import timezone
+
+MAX_ATTEMPTS = 5
+
+
+class Job(Model):
+
+    class Status(TextChoices):
+        QUEUED = 'queued', 'Queued'
+        RUNNING = 'running', 'Running'
+        DONE = 'done', 'Done'
+        FAILED = 'failed', 'Failed'
+
+    task = CharField(max_length=256, verbose_name='Task')
+    args = JSONField(default=list, verbose_name='Arguments')
+    status = CharField(max_length=16,
+                       choices=Status.choices,
+                       default=Status.QUEUED,
+                       verbose_name='Status')
+    attempts = PositiveSmallIntegerField(default=0,
+                                         verbose_name='Attempts made')
+    max_attempts = PositiveSmallIntegerField(default=MAX_ATTEMPTS,
+                                             verbose_name='Attempts allowed')
+    run_after = DateTimeField(default=timezone.now,
+                              verbose_name='Not before')
+    locked_until = DateTimeField(null=True, blank=True,
+                                 verbose_name='Invisible to workers until')
+    last_error = TextField(blank=True, verbose_name='Last error')
+    created_at = DateTimeField(auto_now_add=True, verbose_name='Added')
+
+    class Meta:
+        ordering = ('run_after', 'id')
+        verbose_name = 'job'
+        verbose_name_plural = 'Jobs'
+        indexes = (
+            Index(fields=('status', 'run_after'), name='job_pending_idx'),
+        )
+
+    def __str__(self):
+        return f'{self.task}{tuple(self.args)}'
@@ -0,0 +1,38 @@
+"""Registering functions as jobs and queueing them.
+
+A job is queued in the same transaction as the data it works on, so the
+worker never sees a job whose data has been rolled back.
+"""
+from typing import Callable, Dict
+
+from django.conf import settings
+
+from .models import Job
+
+tasks: Dict[str, Callable] = {}
+
+
+def task(func: Callable) -> Callable:
+    """Register ``func`` so that ``func.delay(*args)`` queues a call.
+
+    Arguments must be JSON serializable: pass ids, not model instances.
+    """
+    name = f'{func.__module__}.{func.__name__}'
+    tasks[name] = func
+
+    def delay(*args) -> Job:
+        return enqueue(name, *args)
+
+    func.delay = delay
+    func.task_name = name
+    return func
+
+
+def enqueue(name: str, *args) -> Job:
+    if name not in tasks:
+        raise LookupError(f'Unknown task {name}')
+    if settings.JOBS_RUN_INLINE:
+        tasks[name](*args)
+        return Job(task=name, args=list(args), status=Job.Status.DONE,
+                   attempts=1)
+    return Job.objects.create(task=name, args=list(args))
@@ -0,0 +1,14 @@
+from typing import List, Optional
+
+from django.core.mail import EmailMultiAlternatives
+
+from .registry import task
+
+
+@task
+def send_email(subject: str, body: str, from_email: Optional[str],
+               to: List[str], html_body: Optional[str] = None):
+    message = EmailMultiAlternatives(subject, body, from_email, to)
+    if html_body is not None:
+        message.attach_alternative(html_body, 'text/html')
+    message.send()
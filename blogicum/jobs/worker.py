@@ -0,0 +1,130 @@
+"""Claiming and running queued jobs.
+
+A worker claims a job with a conditional UPDATE that only succeeds while
+the job is still claimable, so several worker processes can poll the same
+table without locks. A claimed job stays invisible to other workers for
+the visibility timeout; if its worker dies, the job becomes claimable again
+once the timeout passes and is retried, unless it has used up its attempts:
+a job that keeps killing its worker then fails like one that keeps raising.
+"""
+import logging
+import traceback
+from datetime import timedelta
+from threading import Event
+from typing import List, Optional
+
+from django.db import close_old_connections
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job
+from .registry import tasks
+
+logger = logging.getLogger(__name__)
+
+VISIBILITY_TIMEOUT = 300
+RETRY_DELAY = 10
+POLL_INTERVAL = 1.0
+
+
+ABANDONED_ERROR = 'The worker stopped before the job finished.'
+
+
+def _expired(now) -> Q:
+    return Q(status=Job.Status.RUNNING, locked_until__lt=now)
+
+
+def _claimable(now) -> Q:
+    return (Q(status=Job.Status.QUEUED, run_after__lte=now)
+            | (_expired(now) & Q(attempts__lt=F('max_attempts'))))
+
+
+def _fail_abandoned(now):
+    abandoned = Job.objects.filter(_expired(now),
+                                   attempts__gte=F('max_attempts'))
+    # Checked first so that an idle poll does not take the write lock.
+    if abandoned.exists():
+        abandoned.update(status=Job.Status.FAILED, locked_until=None,
+                         last_error=ABANDONED_ERROR)
+
+
+def claim_jobs(limit: int,
+               visibility_timeout: int = VISIBILITY_TIMEOUT) -> List[Job]:
+    now = timezone.now()
+    _fail_abandoned(now)
+    candidates = (Job.objects
+                  .filter(_claimable(now))
+                  .values_list('pk', flat=True)[:limit])
+    claimed = []
+    for pk in candidates:
+        locked_until = now + timedelta(seconds=visibility_timeout)
+        updated = (Job.objects
+                   .filter(_claimable(now), pk=pk)
+                   .update(status=Job.Status.RUNNING,
+                           locked_until=locked_until,
+                           attempts=F('attempts') + 1))
+        if updated:
+            claimed.append(Job.objects.get(pk=pk))
+    return claimed
+
+
+def run_job(job: Job, retry_delay: int = RETRY_DELAY) -> bool:
+    """Run a claimed job, then record success or schedule a retry."""
+    func = tasks.get(job.task)
+    error: Optional[str] = None
+    try:
+        if func is None:
+            raise LookupError(f'Unknown task {job.task}')
+        func(*job.args)
+    except Exception:
+        error = traceback.format_exc()
+        logger.exception('Job %s (%s) failed', job.pk, job.task)
+    finally:
+        close_old_connections()
+    if error is None:
+        _finish(job, status=Job.Status.DONE, locked_until=None)
+        return True
+    if job.attempts >= job.max_attempts:
+        _finish(job, status=Job.Status.FAILED, locked_until=None,
+                last_error=error)
+    else:
+        backoff = retry_delay * 2 ** (job.attempts - 1)
+        _finish(job, status=Job.Status.QUEUED, locked_until=None,
+                last_error=error,
+                run_after=timezone.now() + timedelta(seconds=backoff))
+    return False
+
+
+def _finish(job: Job, **fields):
+    # Only the worker still holding the claim may record the outcome.
+    (Job.objects
+     .filter(pk=job.pk, status=Job.Status.RUNNING, attempts=job.attempts)
+     .update(**fields))
+
+
+def work(stop: Event, poll_interval: float = POLL_INTERVAL,
+         visibility_timeout: int = VISIBILITY_TIMEOUT,
+         once: bool = False) -> int:
+    """Claim and run jobs one at a time until ``stop`` is set.
+
+    With ``once`` the loop also ends as soon as nothing is claimable.
+    """
+    processed = 0
+    try:
+        while not stop.is_set():
+            jobs = claim_jobs(1, visibility_timeout)
+            if not jobs:
+                if once:
+                    break
+                stop.wait(poll_interval)
+                continue
+            run_job(jobs[0])
+            processed += 1
+    finally:
+        close_old_connections()
+    return processed
+
+
+def run_pending() -> int:
+    """Run every claimable job in this thread."""
+    return work(Event(), once=True)
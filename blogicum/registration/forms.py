@@ -1,5 +1,7 @@
 from django.contrib.auth import get_user_model
-from django.contrib.auth.forms import UserCreationForm
+from django.contrib.auth.forms import PasswordResetForm, UserCreationForm
+
+from .tasks import send_password_reset_email
 
 
 class CustomUserCreationForm(UserCreationForm):
@@ -7,3 +9,19 @@ class CustomUserCreationForm(UserCreationForm):
     class Meta(UserCreationForm.Meta):
         model = get_user_model()
         fields = ('username', 'email')
+
+
+class QueuedPasswordResetForm(PasswordResetForm):
+    """Send the reset email from the worker.
+
+    Only the user's id and the request's domain are queued: the job's
+    arguments stay in the database, so the worker makes the token itself.
+    """
+
+    def send_mail(self, subject_template_name, email_template_name,
+                  context, from_email, to_email,
+                  html_email_template_name=None):
+        send_password_reset_email.delay(
+            context['user'].pk, context['domain'], context['site_name'],
+            context['protocol'] == 'https', subject_template_name,
+            email_template_name, from_email, html_email_template_name)
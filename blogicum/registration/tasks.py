@@ -0,0 +1,35 @@
+from typing import Optional
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.forms import PasswordResetForm
+from django.contrib.auth.tokens import default_token_generator
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from jobs.registry import task
+
+
+@task
+def send_password_reset_email(user_id: int, domain: str, site_name: str,
+                              use_https: bool, subject_template_name: str,
+                              email_template_name: str,
+                              from_email: Optional[str],
+                              html_email_template_name: Optional[str] = None):
+    """Render and send the email ``PasswordResetForm.save`` would."""
+    user = (get_user_model()._default_manager
+            .filter(pk=user_id, is_active=True).first())
+    if user is None:
+        return
+    email = getattr(user, user.get_email_field_name())
+    context = {
+        'email': email,
+        'domain': domain,
+        'site_name': site_name,
+        'uid': urlsafe_base64_encode(force_bytes(user.pk)),
+        'user': user,
+        'token': default_token_generator.make_token(user),
+        'protocol': 'https' if use_https else 'http',
+    }
+    PasswordResetForm().send_mail(
+        subject_template_name, email_template_name, context, from_email,
+        email, html_email_template_name=html_email_template_name)
@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+
+
+class SearchConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'search'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .backends import get_backend
+
+        # Map the inverted index while the worker starts, not on the first
+        # search request.
+        get_backend()
@@ -0,0 +1,36 @@
+"""Search backends, chosen with the ``SEARCH_BACKEND`` setting.
+
+``fts5.FTS5Backend`` needs SQLite built with FTS5. ``inverted.
+InvertedIndexBackend`` works with any database and keeps the index in
+``SEARCH_INDEX_DIR``. A backend that cannot run against the database is
+replaced by ``FALLBACK_BACKEND``.
+"""
+import logging
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from .base import BaseSearchBackend
+
+logger = logging.getLogger(__name__)
+
+FALLBACK_BACKEND = 'search.backends.inverted.InvertedIndexBackend'
+
+
+@lru_cache(maxsize=None)
+def get_backend() -> BaseSearchBackend:
+    backend_class = import_string(settings.SEARCH_BACKEND)
+    if not backend_class.is_available():
+        logger.warning('Search backend %s is not available, using %s',
+                       settings.SEARCH_BACKEND, FALLBACK_BACKEND)
+        backend_class = import_string(FALLBACK_BACKEND)
+    return backend_class()
+
+
+@receiver(setting_changed)
+def reset_backend(*, setting: str, **kwargs):
+    if setting in ('SEARCH_BACKEND', 'SEARCH_INDEX_DIR'):
+        get_backend.cache_clear()
@@ -0,0 +1,40 @@
+from collections.abc import Sequence
+
+from django.db.models import QuerySet
+
+from blog.models import Post
+
+from ..text import make_snippet
+
+
+class BaseSearchBackend:
+    """What the search view, the post admin and the signals rely on."""
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """Whether this backend can run against the configured database."""
+        return True
+
+    def search(self, queryset: QuerySet, query: str) -> Sequence:
+        """Filter posts by ``query``, best matches first.
+
+        Anything a paginator can count and slice will do for a result.
+        """
+        raise NotImplementedError
+
+    def filter_matching(self, queryset: QuerySet, query: str) -> QuerySet:
+        """Filter posts by ``query`` without ranking them."""
+        raise NotImplementedError
+
+    def snippet(self, post: Post, query: str) -> str:
+        """Part of the post around the match, see ``text.make_snippet``."""
+        return make_snippet((post.text, post.title), query)
+
+    def index_post(self, post: Post):
+        raise NotImplementedError
+
+    def unindex_post(self, post_id: int):
+        raise NotImplementedError
+
+    def rebuild(self):
+        raise NotImplementedError
@@ -0,0 +1,122 @@
+"""Full-text index of post titles and texts in an SQLite FTS5 table.
+
+The table is keyed by post id. It keeps its own copy of the indexed
+columns, so a post can be dropped from it by id alone and snippets are cut
+without reading ``blog_post``. Signals keep it in sync: unlike triggers,
+they survive the table rebuilds SQLite migrations do.
+"""
+import sqlite3
+from contextlib import closing
+from typing import Optional
+
+from django.db import connection
+from django.db.models import QuerySet
+from django.db.models.expressions import RawSQL
+
+from blog.models import Post
+
+from ..text import (
+    MATCH_END,
+    MATCH_START,
+    SNIPPET_TOKENS,
+    split_query,
+    strip_markers,
+)
+from .base import BaseSearchBackend
+
+INDEX_TABLE = 'search_post_fts'
+TITLE_WEIGHT = 5.0
+TEXT_WEIGHT = 1.0
+# ``text.strip_markers`` in SQL: snippets mark matches with these.
+STRIPPED = "replace(replace({}, char(2), ''), char(3), '')"
+
+
+def has_fts5() -> bool:
+    """Whether the SQLite library Django uses was built with FTS5."""
+    if connection.vendor != 'sqlite':
+        return False
+    # A private connection, so the check can run before the database is
+    # set up; the library is the same one the default connection uses.
+    with closing(sqlite3.connect(':memory:')) as probe:
+        return bool(probe.execute(
+            "SELECT sqlite_compileoption_used('ENABLE_FTS5')").fetchone()[0])
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """Turn user input into an FTS5 query matching all of its words.
+
+    Words are quoted so FTS5 operators typed by the user are searched for
+    literally. The last word also matches as a prefix.
+    """
+    terms = split_query(query)
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+class FTS5Backend(BaseSearchBackend):
+
+    @classmethod
+    def is_available(cls) -> bool:
+        # The migration leaves out the index table without FTS5 too.
+        return has_fts5()
+
+    def search(self, queryset: QuerySet, query: str) -> QuerySet:
+        match = build_match_query(query)
+        if match is None:
+            return queryset.none()
+        post_table = queryset.model._meta.db_table
+        return queryset.extra(
+            select={
+                'rank': f'bm25({INDEX_TABLE}, %s, %s)',
+                'snippet': (f"snippet({INDEX_TABLE}, -1, %s, %s, '…', "
+                            f'{SNIPPET_TOKENS})'),
+            },
+            select_params=(TITLE_WEIGHT, TEXT_WEIGHT,
+                           MATCH_START, MATCH_END),
+            tables=(INDEX_TABLE,),
+            where=(f'{INDEX_TABLE}.rowid = {post_table}.id',
+                   f'{INDEX_TABLE} MATCH %s'),
+            params=(match,),
+        ).order_by('rank', '-pub_date')
+
+    def filter_matching(self, queryset: QuerySet, query: str) -> QuerySet:
+        match = build_match_query(query)
+        if match is None:
+            return queryset.none()
+        return queryset.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {INDEX_TABLE} WHERE {INDEX_TABLE} MATCH %s',
+            (match,)))
+
+    def snippet(self, post: Post, query: str) -> str:
+        snippet = getattr(post, 'snippet', None)
+        if snippet is None:
+            return super().snippet(post, query)
+        return snippet
+
+    def index_post(self, post: Post):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {INDEX_TABLE} WHERE rowid = %s',
+                           (post.pk,))
+            cursor.execute(
+                f'INSERT INTO {INDEX_TABLE} (rowid, title, text) '
+                f'VALUES (%s, %s, %s)',
+                (post.pk, strip_markers(post.title), strip_markers(post.text)))
+
+    def unindex_post(self, post_id: int):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {INDEX_TABLE} WHERE rowid = %s',
+                           (post_id,))
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {INDEX_TABLE}')
+            cursor.execute(
+                f'INSERT INTO {INDEX_TABLE} (rowid, title, text) '
+                f'SELECT id, {STRIPPED.format("title")}, '
+                f'{STRIPPED.format("text")} FROM blog_post')
+            cursor.execute(
+                f"INSERT INTO {INDEX_TABLE} ({INDEX_TABLE}) "
+                f"VALUES ('optimize')")
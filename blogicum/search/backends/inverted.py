@@ -0,0 +1,334 @@
+"""In-process inverted index for databases without FTS5.
+
+The index lives in ``SEARCH_INDEX_DIR`` as two files.
+
+``segment`` is an immutable snapshot written by ``rebuild``: arrays of
+unsigned 32 bit integers in native byte order.
+
+    header       magic, version, term count, post count
+    term_starts  term count + 1 offsets into the term blob
+    post_starts  term count + 1 offsets into postings, counted in pairs
+    terms        UTF-8 terms in byte order, padded to 4 bytes
+    postings     (post id, weighted term frequency) pairs by post id
+
+Every process maps it read-only, so all workers share one copy of its pages
+through the OS page cache, and finds terms in it by binary search.
+
+``journal`` has a JSON line for every post indexed or removed since the
+segment was written. Before each search a process replays the lines it has
+not seen yet into a small in-memory overlay, which wins over the segment.
+The overlay only grows until the next ``rebuild``, so run
+``manage.py rebuild_search_index`` periodically.
+"""
+import json
+import logging
+import math
+import mmap
+import os
+import threading
+from array import array
+from collections import Counter, defaultdict
+from collections.abc import Sequence
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import QuerySet
+
+from blog.models import Post
+
+from ..text import normalize, split_query, tokenize
+from .base import BaseSearchBackend
+
+try:
+    import fcntl
+except ImportError:  # Windows: a single dev server needs no file lock.
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+MAGIC = 0x58444e49  # b'INDX' read as a little-endian integer
+VERSION = 1
+HEADER_WORDS = 4
+SEGMENT_FILE = 'segment'
+JOURNAL_FILE = 'journal'
+LOCK_FILE = 'lock'
+TITLE_WEIGHT = 5
+TEXT_WEIGHT = 1
+# Term frequency saturation, as ``k1`` in BM25.
+SATURATION = 1.2
+MAX_RESULTS = 1000
+# Ids bound to one query, well under the 999 variables of older SQLite.
+ID_BATCH_SIZE = 500
+REBUILD_CHUNK_SIZE = 2000
+
+Frequencies = Dict[str, int]
+
+
+def weigh_terms(title: str, text: str) -> Frequencies:
+    frequencies = Counter()
+    for term in tokenize(title):
+        frequencies[term] += TITLE_WEIGHT
+    for term in tokenize(text):
+        frequencies[term] += TEXT_WEIGHT
+    return dict(frequencies)
+
+
+class Segment:
+    """Read-only view of a segment file; empty if there is none yet."""
+
+    def __init__(self, path: Path):
+        self.term_count = self.post_count = 0
+        try:
+            with open(path, 'rb') as file:
+                buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            # ValueError: an empty file cannot be mapped.
+            return
+        words = memoryview(buffer).cast('I')
+        magic, version, term_count, post_count = words[:HEADER_WORDS]
+        if (magic, version) != (MAGIC, VERSION):
+            logger.warning('Ignoring search segment %s of another format, '
+                           'rebuild the index', path)
+            return
+        self.term_count, self.post_count = term_count, post_count
+        starts = HEADER_WORDS + term_count + 1
+        self._term_starts = words[HEADER_WORDS:starts]
+        self._post_starts = words[starts:starts + term_count + 1]
+        terms_start = (starts + term_count + 1) * words.itemsize
+        terms_end = terms_start + self._term_starts[-1]
+        self._terms = memoryview(buffer)[terms_start:terms_end]
+        self._postings = words[_padded(terms_end) // words.itemsize:]
+
+    def term(self, index: int) -> bytes:
+        return bytes(self._terms[self._term_starts[index]:
+                                 self._term_starts[index + 1]])
+
+    def _lower_bound(self, term: bytes) -> int:
+        low, high = 0, self.term_count
+        while low < high:
+            middle = (low + high) // 2
+            if self.term(middle) < term:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def find(self, term: bytes, prefix: bool = False) -> range:
+        """Indexes of ``term``, or of all terms starting with it."""
+        first = self._lower_bound(term)
+        last = first
+        while (last < self.term_count
+               and (self.term(last).startswith(term) if prefix
+                    else self.term(last) == term)):
+            last += 1
+        return range(first, last)
+
+    def postings(self, index: int) -> Iterable[Tuple[int, int]]:
+        start = self._post_starts[index] * 2
+        end = self._post_starts[index + 1] * 2
+        pairs = self._postings[start:end]
+        return zip(pairs[::2], pairs[1::2])
+
+
+def _padded(size: int) -> int:
+    return (size + 3) // 4 * 4
+
+
+def write_segment(path: Path, posts: Iterable[Tuple[int, Frequencies]]):
+    postings = defaultdict(list)
+    post_count = 0
+    for post_id, frequencies in posts:
+        post_count += 1
+        for term, frequency in frequencies.items():
+            postings[term.encode()].append((post_id, frequency))
+    terms = sorted(postings)
+    term_starts, post_starts = array('I', [0]), array('I', [0])
+    pairs = array('I')
+    for term in terms:
+        term_starts.append(term_starts[-1] + len(term))
+        for post_id, frequency in sorted(postings[term]):
+            pairs.extend((post_id, frequency))
+        post_starts.append(len(pairs) // 2)
+    blob = b''.join(terms)
+    header = array('I', (MAGIC, VERSION, len(terms), post_count))
+    temporary = path.with_suffix('.tmp')
+    with open(temporary, 'wb') as file:
+        for part in (header, term_starts, post_starts):
+            part.tofile(file)
+        file.write(blob.ljust(_padded(len(blob)), b'\0'))
+        pairs.tofile(file)
+    os.replace(temporary, path)
+
+
+def _stamp(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns
+
+
+class RankedPosts(Sequence):
+    """Posts of ``queryset`` in the order of ``post_ids``.
+
+    Only the slice asked for is read, so the paginator binds no more than a
+    page of ids to a query.
+    """
+
+    def __init__(self, queryset: QuerySet, post_ids: List[int]):
+        self.queryset = queryset
+        self.post_ids = post_ids
+
+    def __len__(self):
+        return len(self.post_ids)
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1 or None][0]
+        post_ids = self.post_ids[index]
+        posts = self.queryset.in_bulk(post_ids)
+        return [posts[post_id] for post_id in post_ids if post_id in posts]
+
+
+def filter_visible(queryset: QuerySet, post_ids: List[int]) -> List[int]:
+    """Keep the ids of ``post_ids`` that ``queryset`` has, in order."""
+    visible = set()
+    for start in range(0, len(post_ids), ID_BATCH_SIZE):
+        visible.update(queryset
+                       .filter(pk__in=post_ids[start:start + ID_BATCH_SIZE])
+                       .values_list('pk', flat=True))
+    return [post_id for post_id in post_ids if post_id in visible]
+
+
+class InvertedIndexBackend(BaseSearchBackend):
+
+    def __init__(self):
+        self.directory = Path(settings.SEARCH_INDEX_DIR)
+        self._lock = threading.Lock()
+        self._journal_stamp = None
+        self._segment = Segment(self.directory / SEGMENT_FILE)
+        self._segment_stamp = _stamp(self.directory / SEGMENT_FILE)
+        self._reset_overlay()
+        with self._lock:
+            self._refresh()
+
+    def _reset_overlay(self):
+        # post id -> term frequencies, or None for a removed post.
+        self._overlay: Dict[int, Optional[Frequencies]] = {}
+        self._journal_offset = 0
+
+    def _refresh(self):
+        segment_path = self.directory / SEGMENT_FILE
+        journal_path = self.directory / JOURNAL_FILE
+        segment_stamp = _stamp(segment_path)
+        if segment_stamp != self._segment_stamp:
+            self._segment = Segment(segment_path)
+            self._segment_stamp = segment_stamp
+            self._reset_overlay()
+        journal_stamp = _stamp(journal_path)
+        if journal_stamp is None:
+            return
+        if (self._journal_stamp is not None
+                and journal_stamp[0] != self._journal_stamp[0]):
+            # ``rebuild`` started a new journal.
+            self._reset_overlay()
+        self._journal_stamp = journal_stamp
+        with open(journal_path, 'rb') as journal:
+            journal.seek(self._journal_offset)
+            data = journal.read()
+        # A line still being appended is picked up by the next refresh.
+        complete = data.rfind(b'\n') + 1
+        self._journal_offset += complete
+        for line in data[:complete].splitlines():
+            entry = json.loads(line)
+            self._overlay[entry['id']] = entry.get('terms')
+
+    def _lookup(self, term: str, prefix: bool) -> Dict[int, int]:
+        found: Dict[int, int] = {}
+        segment = self._segment
+        for index in segment.find(term.encode(), prefix):
+            for post_id, frequency in segment.postings(index):
+                if post_id not in self._overlay:
+                    found[post_id] = found.get(post_id, 0) + frequency
+        for post_id, frequencies in self._overlay.items():
+            for candidate, frequency in (frequencies or {}).items():
+                if candidate == term or (prefix
+                                         and candidate.startswith(term)):
+                    found[post_id] = found.get(post_id, 0) + frequency
+        return found
+
+    def match(self, query: str) -> List[int]:
+        """Ids of posts having every word of ``query``, best first."""
+        terms = [normalize(word) for word in split_query(query)]
+        if not terms:
+            return []
+        with self._lock:
+            self._refresh()
+            total = self._segment.post_count + len(self._overlay)
+            scores: Optional[Dict[int, float]] = None
+            for position, term in enumerate(terms):
+                found = self._lookup(term, prefix=position == len(terms) - 1)
+                idf = math.log(1 + total / len(found)) if found else 0
+                term_scores = {
+                    post_id: idf * frequency / (frequency + SATURATION)
+                    for post_id, frequency in found.items()
+                }
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {post_id: score + term_scores[post_id]
+                              for post_id, score in scores.items()
+                              if post_id in term_scores}
+        return sorted(scores, key=lambda post_id: (-scores[post_id],
+                                                   -post_id))
+
+    def search(self, queryset: QuerySet, query: str) -> RankedPosts:
+        post_ids = self.match(query)[:MAX_RESULTS]
+        return RankedPosts(queryset, filter_visible(queryset, post_ids))
+
+    def filter_matching(self, queryset: QuerySet, query: str) -> QuerySet:
+        # The admin adds its own filters, so only the best matches fit.
+        return queryset.filter(pk__in=self.match(query)[:ID_BATCH_SIZE])
+
+    @contextmanager
+    def _write_lock(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / LOCK_FILE, 'a') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+
+    def _append(self, entry: Dict):
+        line = json.dumps(entry, ensure_ascii=False,
+                          separators=(',', ':')) + '\n'
+        with self._write_lock():
+            with open(self.directory / JOURNAL_FILE, 'ab') as journal:
+                journal.write(line.encode())
+
+    def index_post(self, post: Post):
+        entry = {'id': post.pk, 'terms': weigh_terms(post.title, post.text)}
+        # A rolled back save must not reach the journal; see ``rebuild``.
+        transaction.on_commit(lambda: self._append(entry))
+
+    def unindex_post(self, post_id: int):
+        transaction.on_commit(lambda: self._append({'id': post_id}))
+
+    def rebuild(self):
+        # Posts are read under the lock, so a save committed meanwhile is
+        # journaled after the new segment replaces the old one.
+        with self._write_lock():
+            posts = (Post.objects
+                     .order_by('pk')
+                     .values_list('pk', 'title', 'text'))
+            write_segment(
+                self.directory / SEGMENT_FILE,
+                ((post_id, weigh_terms(title, text))
+                 for post_id, title, text in posts.iterator(
+                     chunk_size=REBUILD_CHUNK_SIZE)))
+            journal = self.directory / JOURNAL_FILE
+            temporary = journal.with_suffix('.tmp')
+            temporary.write_bytes(b'')
+            os.replace(temporary, journal)
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from search.backends import get_backend
+
+
+class Command(BaseCommand):
+    help = 'Re-index every post for full-text search.'
+
+    def handle(self, *args, **options):
+        get_backend().rebuild()
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt.'))
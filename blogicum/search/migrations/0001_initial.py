@@ -0,0 +1,42 @@
+from django.db import migrations
+
+CREATE_INDEX = [
+    "CREATE VIRTUAL TABLE search_post_fts USING fts5("
+    "title, text, tokenize='unicode61 remove_diacritics 2')",
+    'INSERT INTO search_post_fts (rowid, title, text) '
+    'SELECT id, title, text FROM blog_post',
+]
+
+
+def has_fts5(schema_editor) -> bool:
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        return bool(cursor.fetchone()[0])
+
+
+def create_index(apps, schema_editor):
+    # Without FTS5 only search.backends.inverted can be used.
+    if has_fts5(schema_editor):
+        for statement in CREATE_INDEX:
+            schema_editor.execute(statement)
+
+
+def drop_index(apps, schema_editor):
+    if has_fts5(schema_editor):
+        schema_editor.execute('DROP TABLE IF EXISTS search_post_fts')
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('blog', '0010_post_image_sizes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,37 @@
+import logging
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from blog.models import Post
+
+from .backends import get_backend
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=Post)
+def update_search_index(sender, instance: Post, update_fields=None,
+                        **kwargs):
+    if update_fields is not None and not {'title', 'text'} & set(
+            update_fields):
+        return
+    # A broken index must not cost the author their post; the savepoint
+    # keeps a failed index write from spoiling the save's transaction.
+    # ``rebuild_search_index`` catches the post up later.
+    try:
+        with transaction.atomic():
+            get_backend().index_post(instance)
+    except Exception:
+        logger.exception('Cannot index post %s', instance.pk)
+
+
+@receiver(post_delete, sender=Post)
+def remove_from_search_index(sender, instance: Post, **kwargs):
+    try:
+        with transaction.atomic():
+            get_backend().unindex_post(instance.pk)
+    except Exception:
+        logger.exception('Cannot remove post %s from the search index',
+                         instance.pk)
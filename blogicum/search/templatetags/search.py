@@ -0,0 +1,16 @@
+from django import template
+
+from search.backends import get_backend
+from search.text import highlight
+
+register = template.Library()
+
+
+@register.simple_tag
+def search_snippet(post, query: str):
+    """Usage: ``{% search_snippet post query %}``.
+
+    Escapes the part of the post around the match and wraps matched words
+    in ``<mark>``.
+    """
+    return highlight(get_backend().snippet(post, query))
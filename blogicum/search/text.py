@@ -0,0 +1,84 @@
+"""Splitting text into search terms and cutting highlighted snippets."""
+import re
+import unicodedata
+from typing import Iterable, List, Optional, Tuple
+
+from django.utils.html import escape
+from django.utils.safestring import SafeString, mark_safe
+
+SNIPPET_TOKENS = 16
+ELLIPSIS = '…'
+# Matches are marked before the snippet is escaped. Posts may contain
+# these characters too, so they are stripped from the text first, and
+# ``highlight`` only turns matched pairs into tags.
+MATCH_START = '\x02'
+MATCH_END = '\x03'
+TERM_RE = re.compile(r'\w+')
+MARKED_RE = re.compile(f'{MATCH_START}([^{MATCH_START}{MATCH_END}]*)'
+                       f'{MATCH_END}')
+MARKERS = str.maketrans('', '', MATCH_START + MATCH_END)
+
+
+def strip_markers(text: str) -> str:
+    return text.translate(MARKERS)
+
+
+def split_query(query: str) -> List[str]:
+    """Words of a query as typed; the last one also matches as a prefix."""
+    return TERM_RE.findall(query)
+
+
+def normalize(word: str) -> str:
+    """Fold case and drop diacritics, as FTS5's ``unicode61`` tokenizer."""
+    decomposed = unicodedata.normalize('NFKD', word.casefold())
+    return ''.join(char for char in decomposed
+                   if not unicodedata.combining(char))
+
+
+def tokenize(text: str) -> List[str]:
+    return [normalize(word) for word in TERM_RE.findall(text)]
+
+
+def _matches(word: str, terms: List[str]) -> bool:
+    word = normalize(word)
+    return (word in terms[:-1] or word.startswith(terms[-1]))
+
+
+def make_snippet(texts: Iterable[str], query: str,
+                 size: int = SNIPPET_TOKENS) -> str:
+    """Cut ``size`` words around the first match in the first text having
+    one, with matches wrapped in ``MATCH_START`` and ``MATCH_END``.
+    """
+    terms = [normalize(word) for word in split_query(query)]
+    fallback: Optional[str] = None
+    for text in map(strip_markers, texts):
+        words: List[Tuple[int, int, bool]] = [
+            (word.start(), word.end(), bool(terms)
+             and _matches(word.group(), terms))
+            for word in TERM_RE.finditer(text)
+        ]
+        if fallback is None:
+            fallback = text
+        first = next((position for position, word in enumerate(words)
+                      if word[2]), None)
+        if first is None:
+            continue
+        start = max(0, min(first - size // 4, len(words) - size))
+        window = words[start:start + size]
+        parts = []
+        cursor = window[0][0]
+        for word_start, word_end, matched in window:
+            parts.append(text[cursor:word_start])
+            word = text[word_start:word_end]
+            parts.append(f'{MATCH_START}{word}{MATCH_END}'
+                         if matched else word)
+            cursor = word_end
+        prefix = ELLIPSIS if start > 0 else ''
+        suffix = ELLIPSIS if start + size < len(words) else ''
+        return prefix + ''.join(parts) + suffix
+    return ' '.join((fallback or '').split()[:size])
+
+
+def highlight(snippet: str) -> SafeString:
+    marked = MARKED_RE.sub(r'<mark>\1</mark>', str(escape(snippet)))
+    return mark_safe(strip_markers(marked))
@@ -0,0 +1,31 @@
+from django.utils.http import urlencode
+from django.views.generic import ListView
+
+from blog.paginators import CachedCountPaginator
+from blog.utils import get_posts
+from blog.views import POSTINPAGE
+
+from .backends import get_backend
+
+QUERY_KWARG = 'q'
+
+
+class SearchView(ListView):
+    template_name = 'search/results.html'
+    paginate_by = POSTINPAGE
+    paginator_class = CachedCountPaginator
+
+    def get_search_query(self) -> str:
+        return self.request.GET.get(QUERY_KWARG, '').strip()
+
+    def get_queryset(self):
+        return get_backend().search(get_posts(to_filter=True),
+                                    self.get_search_query())
+
+    def get_context_data(self, **kwargs):
+        query = self.get_search_query()
+        return super().get_context_data(
+            query=query,
+            pagination_query=urlencode({QUERY_KWARG: query}),
+            **kwargs,
+        )
@@ -0,0 +1,33 @@
+from http import HTTPStatus
+
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.mark.parametrize(
+    'post_changes',
+    [{'is_published': False}, {'category__is_published': False}],
+)
+def test_comment_on_hidden_post(
+        user_client, another_user_client, post_with_published_location,
+        post_changes
+):
+    post = post_with_published_location
+    if 'category__is_published' in post_changes:
+        post.category.is_published = False
+        post.category.save()
+    else:
+        post.is_published = False
+        post.save()
+    url = f'/posts/{post.id}/comment/'
+
+    response = another_user_client.post(url, data={'text': 'Текст'})
+    assert response.status_code == HTTPStatus.NOT_FOUND, (
+        'Убедитесь, что к снятой с публикации записи нельзя оставить '
+        'комментарий, если вы не её автор.'
+    )
+    response = user_client.post(url, data={'text': 'Текст'})
+    assert response.status_code == HTTPStatus.FOUND
+    post.refresh_from_db()
+    assert post.comments.count() == post.comment_count == 1
@@ -0,0 +1,182 @@
+import re
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
+
+from blog.views import POSTINPAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _revalidate(client, url, etag):
+    return client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+
+def test_post_page_changes_with_comments(
+        user_client, another_user_client, post_with_published_location
+):
+    post = post_with_published_location
+    url = f'/posts/{post.id}/'
+    etag = another_user_client.get(url)['ETag']
+    assert _revalidate(another_user_client, url, etag).status_code == (
+        HTTPStatus.NOT_MODIFIED), (
+        'Убедитесь, что страница публикации отвечает 304, если она не '
+        'изменилась.'
+    )
+    assert user_client.get(url)['ETag'] != etag, (
+        'Убедитесь, что ETag страницы зависит от пользователя.'
+    )
+
+    another_user_client.post(f'/posts/{post.id}/comment/',
+                             data={'text': 'Новый комментарий'})
+    response = _revalidate(another_user_client, url, etag)
+    assert response.status_code == HTTPStatus.OK
+    assert response['ETag'] != etag
+
+
+def test_post_page_changes_with_the_author_name(
+        another_user_client, post_with_published_location
+):
+    post = post_with_published_location
+    url = f'/posts/{post.id}/'
+    etag = another_user_client.get(url)['ETag']
+    post.author.username = 'renamed_author'
+    post.author.save()
+    response = _revalidate(another_user_client, url, etag)
+    assert response.status_code == HTTPStatus.OK, (
+        'Убедитесь, что ETag страницы публикации меняется вместе с именем '
+        'автора.'
+    )
+    assert '@renamed_author' in response.content.decode('utf-8')
+
+
+def test_hidden_post_is_not_served_as_not_modified(
+        user_client, another_user_client, post_with_published_location
+):
+    post = post_with_published_location
+    url = f'/posts/{post.id}/'
+    etag = another_user_client.get(url)['ETag']
+    post.is_published = False
+    post.save()
+    assert _revalidate(another_user_client, url, etag).status_code == (
+        HTTPStatus.NOT_FOUND)
+
+
+def test_post_page_is_rendered_again_after_a_new_login(
+        user, post_with_published_location
+):
+    client = Client(enforce_csrf_checks=True)
+    client.force_login(user)
+    url = f'/posts/{post_with_published_location.id}/'
+    etag = client.get(url)['ETag']
+    client.logout()
+    client.force_login(user)
+    response = _revalidate(client, url, etag)
+    assert response.status_code == HTTPStatus.OK, (
+        'Убедитесь, что после нового входа страница с формами не отдаётся '
+        'из кеша браузера со старым CSRF-токеном.'
+    )
+    token = re.search(r'name="csrfmiddlewaretoken" value="([^"]+)"',
+                      response.content.decode('utf-8')).group(1)
+    response = client.post(f'{url}comment/',
+                           data={'text': 'Новый комментарий',
+                                 'csrfmiddlewaretoken': token})
+    assert response.status_code == HTTPStatus.FOUND
+
+
+def test_anonymous_cached_feed_revalidates_without_queries(
+        client, many_posts_with_published_locations,
+        django_assert_num_queries
+):
+    etag = client.get('/')['ETag']
+    with django_assert_num_queries(0):
+        response = _revalidate(client, '/', etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response['X-Feed-Cache'] == 'HIT'
+
+
+def test_feed_changes_when_a_post_is_deleted(
+        user_client, many_posts_with_published_locations
+):
+    response = user_client.get('/')
+    etag = response['ETag']
+    response.context['page_obj'][-1].delete()
+    assert _revalidate(user_client, '/', etag).status_code == HTTPStatus.OK
+
+
+def test_post_page_changes_when_edited(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    url = f'/posts/{post.id}/'
+    feed_etag = user_client.get('/')['ETag']
+    etag = user_client.get(url)['ETag']
+    post.title = 'Новый заголовок'
+    post.save()
+    assert _revalidate(user_client, url, etag).status_code == HTTPStatus.OK
+    assert _revalidate(user_client, '/', feed_etag).status_code == (
+        HTTPStatus.OK)
+
+
+@pytest.mark.parametrize('url', [
+    '/', '/category/{post.category.slug}/', '/profile/{post.author.username}/',
+])
+def test_list_validator_reads_only_the_page_window(
+        user_client, many_posts_with_published_locations, url
+):
+    post = many_posts_with_published_locations[0]
+    url = url.format(post=post)
+    etag = user_client.get(url)['ETag']
+    with CaptureQueriesContext(connection) as queries:
+        response = _revalidate(user_client, url, etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    validator_sql = queries.captured_queries[-1]['sql']
+    assert f'LIMIT {POSTINPAGE + 1}' in validator_sql, (
+        'Убедитесь, что ETag списка считается по окну текущей страницы.'
+    )
+    assert 'COUNT(' not in validator_sql.upper()
+
+
+def test_list_etag_follows_later_pages(
+        user_client, many_posts_with_published_locations
+):
+    first_page = user_client.get('/')
+    cursor = first_page.context['page_obj'].next_cursor
+    url = f'/?cursor={cursor}'
+    etag = user_client.get(url)['ETag']
+    assert etag != first_page['ETag']
+    post = user_client.get(url).context['page_obj'][0]
+    post.text = 'Изменённый текст'
+    post.save()
+    assert _revalidate(user_client, url, etag).status_code == HTTPStatus.OK
+
+
+def test_profile_changes_with_the_owner_name(user, user_client):
+    url = f'/profile/{user.username}/'
+    etag = user_client.get(url)['ETag']
+    user.first_name = 'Новое имя'
+    user.save()
+    response = _revalidate(user_client, url, etag)
+    assert response.status_code == HTTPStatus.OK, (
+        'Убедитесь, что ETag страницы профиля меняется вместе с данными '
+        'пользователя.'
+    )
+    assert 'Новое имя' in response.content.decode('utf-8')
+
+
+def test_empty_category_changes_with_its_description(
+        user_client, published_category
+):
+    url = f'/category/{published_category.slug}/'
+    etag = user_client.get(url)['ETag']
+    published_category.description = 'Новое описание'
+    published_category.save()
+    response = _revalidate(user_client, url, etag)
+    assert response.status_code == HTTPStatus.OK, (
+        'Убедитесь, что ETag страницы категории меняется вместе с '
+        'категорией.'
+    )
+    assert 'Новое описание' in response.content.decode('utf-8')
@@ -0,0 +1,39 @@
+import pytest
+from django.db import connection
+
+from blogicum import dbstats
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def stats():
+    dbstats.reset_stats()
+    yield
+    dbstats.reset_stats()
+
+
+def test_kept_connection_is_reused(client):
+    client.get('/')
+    client.get('/')
+    assert dbstats.get_stats()['reused'] >= 2, (
+        'Убедитесь, что соединение с базой данных используется повторно.'
+    )
+
+
+def test_broken_connection_is_replaced(client, monkeypatch):
+    connection.ensure_connection()
+    monkeypatch.setattr(connection, 'is_usable', lambda: False)
+    client.get('/')
+    assert dbstats.get_stats()['discarded'] == 1, (
+        'Убедитесь, что неработающее соединение закрывается до запроса.'
+    )
+
+
+def test_counters_are_reported_in_debug(client, settings):
+    settings.DEBUG = True
+    # Outside INTERNAL_IPS, so the debug toolbar stays off.
+    response = client.get('/', REMOTE_ADDR='10.0.0.1')
+    assert 'reused=' in response['X-DB-Connections']
+    settings.DEBUG = False
+    assert 'X-DB-Connections' not in client.get('/')
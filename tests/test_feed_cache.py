@@ -0,0 +1,177 @@
+import pytest
+from django.core.cache import cache as default_cache
+
+from blog import cache
+from blog.cache import get_stats
+from blog.models import Category, Location
+from blog.utils import get_posts
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def stats():
+    cache.reset_stats()
+    yield
+    cache.reset_stats()
+
+
+def _assert_feed_cache_cycle(client, post, url):
+    first = client.get(url)
+    second = client.get(url)
+    assert first['X-Feed-Cache'] == 'MISS'
+    assert second['X-Feed-Cache'] == 'HIT', (
+        f'Убедитесь, что страница `{url}` для анонимного посетителя '
+        'отдаётся из кеша при повторном запросе.'
+    )
+    assert second.content == first.content
+
+    post.title = 'Совершенно новый заголовок'
+    post.save()
+    response = client.get(url)
+    assert response['X-Feed-Cache'] == 'MISS', (
+        'Убедитесь, что кеш ленты сбрасывается при изменении публикации.'
+    )
+    assert post.title in response.content.decode('utf-8')
+
+
+def test_anonymous_feed_is_cached(client, post_with_published_location):
+    post = post_with_published_location
+    for url in ('/', f'/category/{post.category.slug}/'):
+        _assert_feed_cache_cycle(client, post, url)
+    assert get_stats() == {'hits': 2, 'misses': 4}
+
+
+def test_file_backend(
+        client, settings, tmp_path, post_with_published_location
+):
+    settings.CACHES = {
+        **settings.CACHES,
+        'feed': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': tmp_path,
+        },
+    }
+    _assert_feed_cache_cycle(client, post_with_published_location, '/')
+
+
+def test_comment_expires_feed(client, mixer, post_with_published_location):
+    client.get('/')
+    mixer.blend('blog.Comment', post=post_with_published_location)
+    response = client.get('/')
+    assert response['X-Feed-Cache'] == 'MISS'
+    assert '(1)' in response.content.decode('utf-8')
+
+
+def test_logged_in_users_bypass_cache(
+        user_client, post_with_published_location
+):
+    user_client.get('/')
+    response = user_client.get('/')
+    assert 'X-Feed-Cache' not in response
+    assert get_stats() == {'hits': 0, 'misses': 0}
+
+
+def test_post_cards_rendered_once_per_version(
+        monkeypatch, mixer, post_with_published_location
+):
+    rendered = []
+    render = cache.render_to_string
+
+    def counting_render(*args, **kwargs):
+        rendered.append(args)
+        return render(*args, **kwargs)
+
+    monkeypatch.setattr(cache, 'render_to_string', counting_render)
+    post = post_with_published_location
+
+    cache.get_post_cards(list(get_posts().filter(pk=post.pk)))
+    cache.get_post_cards(list(get_posts().filter(pk=post.pk)))
+    assert len(rendered) == 1, (
+        'Убедитесь, что карточка публикации берётся из кеша, '
+        'если публикация не менялась.'
+    )
+
+    for change in (
+        lambda: mixer.blend('blog.Comment', post=post),
+        lambda: Category.objects.filter(
+            pk=post.category_id).update(title='Новая категория'),
+        lambda: Location.objects.filter(
+            pk=post.location_id).update(name='Новое место'),
+    ):
+        change()
+        cards = cache.get_post_cards(list(get_posts().filter(pk=post.pk)))
+    assert len(rendered) == 4
+    assert 'Новая категория' in cards[0] and 'Новое место' in cards[0]
+    assert '(1)' in cards[0]
+
+
+def test_lost_generation_does_not_revive_old_pages(
+        client, post_with_published_location
+):
+    post = post_with_published_location
+    # A cleared default cache loses the generation before either render.
+    default_cache.delete(cache.GENERATION_KEY)
+    client.get('/')
+    post.title = 'Совершенно новый заголовок'
+    post.save()
+    default_cache.delete(cache.GENERATION_KEY)
+    response = client.get('/')
+    assert response['X-Feed-Cache'] == 'MISS', (
+        'Убедитесь, что после потери номера поколения кеша '
+        'старые страницы ленты не отдаются снова.'
+    )
+    assert post.title in response.content.decode('utf-8')
+
+
+def test_culling_the_feed_cache_keeps_the_generation(
+        client, settings, tmp_path, post_with_published_location
+):
+    settings.CACHES = {
+        **settings.CACHES,
+        'feed': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': tmp_path,
+            'OPTIONS': {'MAX_ENTRIES': 10, 'CULL_FREQUENCY': 1},
+        },
+    }
+    client.get('/')
+    generation = default_cache.get(cache.GENERATION_KEY)
+    feed_cache = cache.get_feed_cache()
+    for number in range(20):
+        feed_cache.set(f'card:{number}', 'карточка')
+    assert default_cache.get(cache.GENERATION_KEY) == generation, (
+        'Убедитесь, что номер поколения кеша ленты не вытесняется '
+        'при переполнении кеша ленты.'
+    )
+
+
+def test_cache_hits_are_counted_without_shared_writes(
+        client, monkeypatch, post_with_published_location
+):
+    monkeypatch.setattr(cache, 'STATS_FLUSH_INTERVAL', 3600)
+    client.get('/')
+    client.get('/')
+    assert default_cache.get(cache.HITS_KEY) is None, (
+        'Убедитесь, что попадания в кеш ленты не записываются в общий кеш '
+        'при каждом запросе.'
+    )
+    assert get_stats() == {'hits': 1, 'misses': 1}
+    assert default_cache.get(cache.HITS_KEY) == 1
+
+
+def test_unknown_query_parameters_share_the_cached_page(
+        client, many_posts_with_published_locations
+):
+    first = client.get('/')
+    response = client.get('/', {'x': 'random'})
+    assert response['X-Feed-Cache'] == 'HIT', (
+        'Убедитесь, что ключ кеша ленты строится только из параметров, '
+        'которые читает страница.'
+    )
+    assert response.content == first.content
+    cursor = first.context['page_obj'].next_cursor
+    assert client.get('/', {'cursor': cursor})['X-Feed-Cache'] == 'MISS'
+    assert client.get('/', {'cursor': cursor, 'x': 'random'})[
+        'X-Feed-Cache'] == 'HIT'
+    assert client.get('/', {'page': 2})['X-Feed-Cache'] == 'MISS'
@@ -0,0 +1,143 @@
+from datetime import timedelta
+from http import HTTPStatus
+from xml.etree import ElementTree
+
+import pytest
+from django.db import connection
+from django.http import StreamingHttpResponse
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import http_date
+
+from blog import cache
+from blog.feeds import FEED_ITEMS
+
+pytestmark = [pytest.mark.django_db]
+
+ATOM = '{http://www.w3.org/2005/Atom}'
+
+
+def _content(response) -> bytes:
+    if isinstance(response, StreamingHttpResponse):
+        return b''.join(response.streaming_content)
+    return response.content
+
+
+@pytest.fixture
+def feed_posts(mixer, user, published_category, published_location):
+    now = timezone.now()
+    return {
+        'visible': mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            location=published_location, is_published=True,
+            pub_date=now - timedelta(days=1), title='Видимая'),
+        'hidden': mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            is_published=False, pub_date=now - timedelta(days=1),
+            title='Снятая'),
+        'scheduled': mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            is_published=True, pub_date=now + timedelta(days=1),
+            title='Отложенная'),
+    }
+
+
+@pytest.mark.parametrize('url_template', [
+    '/feed/rss/',
+    '/category/{category}/feed/rss/',
+    '/profile/{username}/feed/rss/',
+])
+def test_rss_feeds_stream_visible_posts(
+        client, user, published_category, feed_posts, url_template
+):
+    url = url_template.format(category=published_category.slug,
+                              username=user.username)
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    assert response.streaming, (
+        'Убедитесь, что лента RSS отдаётся потоком.'
+    )
+    assert response['Content-Type'].startswith('application/rss+xml')
+    channel = ElementTree.fromstring(_content(response)).find('channel')
+    titles = [item.findtext('title') for item in channel.iter('item')]
+    assert titles == ['Видимая'], (
+        'Убедитесь, что в ленту попадают только опубликованные публикации.'
+    )
+
+
+def test_atom_feed(client, feed_posts):
+    response = client.get('/feed/atom/')
+    assert response['Content-Type'].startswith('application/atom+xml')
+    feed = ElementTree.fromstring(_content(response))
+    assert [entry.findtext(f'{ATOM}title')
+            for entry in feed.iter(f'{ATOM}entry')] == ['Видимая']
+
+
+def test_unknown_feeds_are_404(client, feed_posts):
+    assert client.get('/feed/json/').status_code == HTTPStatus.NOT_FOUND
+    assert client.get('/category/missing/feed/rss/').status_code == (
+        HTTPStatus.NOT_FOUND)
+
+
+def test_feed_validators_and_cache(
+        client, mixer, published_category, feed_posts,
+        django_assert_num_queries
+):
+    response = client.get('/feed/rss/')
+    first = _content(response)
+    etag = response['ETag']
+    visible = feed_posts['visible']
+    assert response['Last-Modified'] == http_date(
+        max(visible.pub_date, visible.updated_at).timestamp())
+
+    with django_assert_num_queries(1):
+        response = client.get('/feed/rss/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+        'Убедитесь, что лента поддерживает условные запросы по ETag.'
+    )
+    response = client.get(
+        '/feed/rss/', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    # The validators and the cached document; no posts are read.
+    with django_assert_num_queries(1):
+        response = client.get('/feed/rss/')
+        assert _content(response) == first
+
+    mixer.blend('blog.Post', category=published_category,
+                is_published=True, title='Новая',
+                pub_date=timezone.now() - timedelta(hours=1))
+    response = client.get('/feed/rss/', HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert b'\xd0\x9d\xd0\xbe\xd0\xb2\xd0\xb0\xd1\x8f' in _content(response)
+
+
+def test_feed_validators_read_only_the_feed_items(client, feed_posts):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get('/feed/rss/', HTTP_IF_NONE_MATCH='"stale"')
+        _content(response)
+    validator_sql = queries.captured_queries[0]['sql']
+    assert f'LIMIT {FEED_ITEMS}' in validator_sql, (
+        'Убедитесь, что ETag ленты считается только по её публикациям.'
+    )
+    assert 'COUNT(' not in validator_sql.upper()
+
+
+def test_cached_feed_keeps_the_links_of_each_origin(
+        client, settings, feed_posts
+):
+    settings.ALLOWED_HOSTS = ['testserver', 'internal']
+    cache.reset_stats()
+    _content(client.get('/feed/rss/', HTTP_HOST='internal'))
+    for kwargs, origin in (({}, b'http://testserver/'),
+                           ({'secure': True}, b'https://testserver/')):
+        content = _content(client.get('/feed/rss/', **kwargs))
+        assert origin in content, (
+            'Убедитесь, что кешированная лента содержит ссылки на тот '
+            'адрес, по которому её запросили.'
+        )
+        assert b'//internal/' not in content
+    assert cache.get_stats() == {'hits': 0, 'misses': 0}, (
+        'Убедитесь, что запросы лент не учитываются в статистике кеша '
+        'страниц.'
+    )
@@ -0,0 +1,264 @@
+import os
+from io import BytesIO, StringIO
+
+import pytest
+from bs4 import BeautifulSoup
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from PIL import Image, ImageCms
+
+from blog import images
+from blog.images import get_rendition_name
+from blog.models import Post
+from jobs.worker import run_pending
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _jpeg(width: int, height: int, **options) -> SimpleUploadedFile:
+    buffer = BytesIO()
+    Image.new('RGB', (width, height), color=(73, 109, 137)).save(
+        buffer, format='JPEG', **options)
+    return SimpleUploadedFile('big_photo.jpg', buffer.getvalue(),
+                              content_type='image/jpeg')
+
+
+def _post_form_data(category, location):
+    return {
+        'title': 'Фото', 'text': 'Текст', 'pub_date': '2020-01-01 10:00:00',
+        'category': category.id, 'location': location.id,
+        'is_published': True,
+    }
+
+
+def test_upload_creates_renditions(
+        user_client, user, published_category, published_location
+):
+    response = user_client.post('/posts/create/', data={
+        **_post_form_data(published_category, published_location),
+        'image': _jpeg(2000, 1000),
+    })
+    assert response.status_code == 302
+    post = Post.objects.get(author=user)
+    assert post.image_widths == '', (
+        'Убедитесь, что уменьшенные копии создаются в фоне, а не во время '
+        'запроса.'
+    )
+    assert run_pending() == 1
+    post.refresh_from_db()
+    assert post.image_widths == '320,640,1280', (
+        'Убедитесь, что при загрузке изображения создаются его уменьшенные '
+        'копии.'
+    )
+    storage = post.image.storage
+    for width in (320, 640, 1280):
+        with storage.open(get_rendition_name(post.image.name, width)) as fh:
+            assert Image.open(fh).width == width
+
+    extension = os.path.splitext(post.image.name)[1]
+    for url, size in (('/', 640), (f'/posts/{post.id}/', 1280)):
+        soup = BeautifulSoup(user_client.get(url).content, 'html.parser')
+        img = soup.find('img', srcset=True)
+        assert img['loading'] == 'lazy'
+        assert f'_{size}w{extension} {size}w' in img['srcset']
+        assert img['src'].endswith(f'_{size}w{extension}')
+
+
+def test_small_images_are_not_upscaled(mixer, published_category):
+    post = mixer.blend('blog.Post', category=published_category,
+                       image=_jpeg(500, 300))
+    run_pending()
+    post.refresh_from_db()
+    assert post.image_widths == '320,500'
+
+
+def test_backfill_command(mixer, published_category):
+    post = mixer.blend('blog.Post', category=published_category,
+                       image=_jpeg(700, 300))
+    Post.objects.filter(pk=post.pk).update(image_widths='')
+    call_command('generate_image_renditions')
+    post.refresh_from_db()
+    assert post.image_widths == '320,640,700'
+
+
+def _exif_with_gps() -> Image.Exif:
+    exif = Image.Exif()
+    exif[0x010F] = 'Camera maker'
+    exif[0x8825] = {1: 'N', 2: (55.0, 45.0, 0.0)}
+    return exif
+
+
+def test_upload_is_optimized(mixer, published_category):
+    upload = _jpeg(4000, 1000, quality=100, exif=_exif_with_gps())
+    post = mixer.blend('blog.Post', category=published_category,
+                       image=upload)
+    run_pending()
+    post.refresh_from_db()
+    sizes = post.image_sizes
+    assert sizes['original'] == upload.size
+    assert 0 < sizes['optimized'] < sizes['original'], (
+        'Убедитесь, что для публикации сохраняются размеры загруженного '
+        'и оптимизированного изображения.'
+    )
+    assert post.image.size == sizes['optimized']
+    with post.image.storage.open(post.image.name) as fh:
+        picture = Image.open(fh)
+        assert picture.format in images.OPTIMIZED_FORMATS
+        assert max(picture.size) == images.MAX_IMAGE_SIDE
+        assert not picture.getexif(), (
+            'Убедитесь, что из загруженных изображений удаляются метаданные.'
+        )
+
+
+def test_source_format_is_the_fallback(
+        monkeypatch, mixer, published_category
+):
+    monkeypatch.setattr(images, 'OPTIMIZED_FORMATS', ('NO_SUCH_FORMAT',))
+    post = mixer.blend('blog.Post', category=published_category,
+                       image=_jpeg(600, 300, exif=_exif_with_gps()))
+    run_pending()
+    post.refresh_from_db()
+    assert post.image.name.endswith('.jpg')
+    with post.image.storage.open(post.image.name) as fh:
+        assert not Image.open(fh).getexif()
+
+
+def test_png_fallback_drops_metadata(
+        monkeypatch, mixer, published_category
+):
+    monkeypatch.setattr(images, 'OPTIMIZED_FORMATS', ('NO_SUCH_FORMAT',))
+    buffer = BytesIO()
+    Image.new('RGB', (700, 300), color=(73, 109, 137)).save(
+        buffer, format='PNG', exif=_exif_with_gps(),
+        icc_profile=ImageCms.ImageCmsProfile(
+            ImageCms.createProfile('sRGB')).tobytes())
+    post = mixer.blend('blog.Post', category=published_category,
+                       image=SimpleUploadedFile('photo.png',
+                                                buffer.getvalue()))
+    run_pending()
+    post.refresh_from_db()
+    assert post.image.name.endswith('.png')
+    storage = post.image.storage
+    names = [post.image.name] + [get_rendition_name(post.image.name, width)
+                                 for width in (320, 640, 700)]
+    for name in names:
+        with storage.open(name) as fh:
+            picture = Image.open(fh)
+            assert not picture.getexif(), (
+                'Убедитесь, что метаданные удаляются и из изображений PNG, '
+                'и из их уменьшенных копий.'
+            )
+            assert 'icc_profile' not in picture.info
+
+
+def test_optimized_upload_is_kept(mixer, published_category):
+    buffer = BytesIO()
+    Image.effect_noise((600, 300), 64).convert('RGB').save(
+        buffer, format='JPEG', quality=30, optimize=True)
+    upload = SimpleUploadedFile('noise.jpg', buffer.getvalue(),
+                                content_type='image/jpeg')
+    post = mixer.blend('blog.Post', category=published_category,
+                       image=upload)
+    uploaded_name = post.image.name
+    run_pending()
+    post.refresh_from_db()
+    assert post.image_sizes == {'original': upload.size,
+                                'optimized': upload.size}, (
+        'Убедитесь, что изображение не перекодируется, если от этого оно '
+        'только вырастет.'
+    )
+    assert post.image.name == uploaded_name
+    assert post.image.storage.exists(uploaded_name)
+
+
+def test_savings_report(mixer, published_category):
+    post = mixer.blend('blog.Post', category=published_category)
+    Post.objects.filter(pk=post.pk).update(
+        image_sizes={'original': 1000, 'optimized': 250})
+    out = StringIO()
+    call_command('image_savings', stdout=out)
+    assert 'saved: 750 bytes (75.0%)' in out.getvalue()
+
+
+def test_stale_copy_does_not_undo_the_image_job(
+        mixer, published_category, django_capture_on_commit_callbacks
+):
+    post = mixer.blend('blog.Post', category=published_category,
+                       image=_jpeg(700, 300))
+    uploaded_name = post.image.name
+    # Loaded before the job runs, as by an open edit form.
+    stale = Post.objects.get(pk=post.pk)
+    storage = post.image.storage
+    with django_capture_on_commit_callbacks() as callbacks:
+        run_pending()
+        post.refresh_from_db()
+        assert post.image.name != uploaded_name
+        assert storage.exists(uploaded_name), (
+            'Убедитесь, что загруженный файл удаляется только после того, '
+            'как публикация сохранена со ссылкой на новый файл.'
+        )
+    for callback in callbacks:
+        callback()
+    assert not storage.exists(uploaded_name)
+
+    stale.title = 'Новый заголовок'
+    stale.save()
+    stale.refresh_from_db()
+    assert stale.title == 'Новый заголовок'
+    assert stale.image.name == post.image.name, (
+        'Убедитесь, что сохранение публикации не затирает результат '
+        'обработки изображения.'
+    )
+    assert stale.image_widths == '320,640,700'
+    assert stale.image_sizes == post.image_sizes
+    assert storage.exists(stale.image.name)
+
+
+def _stored_files(post):
+    return [post.image.name] + [get_rendition_name(post.image.name, width)
+                                for width in images.parse_widths(
+                                    post.image_widths)]
+
+
+def test_deleted_post_leaves_no_files(
+        mixer, published_category, django_capture_on_commit_callbacks
+):
+    post = mixer.blend('blog.Post', category=published_category,
+                       image=_jpeg(700, 300))
+    run_pending()
+    post.refresh_from_db()
+    names = _stored_files(post)
+    storage = post.image.storage
+    assert all(storage.exists(name) for name in names)
+    with django_capture_on_commit_callbacks(execute=True):
+        post.delete()
+    assert not any(storage.exists(name) for name in names), (
+        'Убедитесь, что при удалении публикации удаляются её изображение '
+        'и его уменьшенные копии.'
+    )
+
+
+def test_replaced_image_leaves_no_files(
+        user_client, user, published_category, published_location,
+        django_capture_on_commit_callbacks
+):
+    user_client.post('/posts/create/', data={
+        **_post_form_data(published_category, published_location),
+        'image': _jpeg(700, 300),
+    })
+    run_pending()
+    post = Post.objects.get(author=user)
+    names = _stored_files(post)
+    storage = post.image.storage
+    with django_capture_on_commit_callbacks(execute=True):
+        user_client.post(f'/posts/{post.id}/edit/', data={
+            **_post_form_data(published_category, published_location),
+            'image': _jpeg(800, 300),
+        })
+    post.refresh_from_db()
+    assert post.image.name not in names
+    assert storage.exists(post.image.name)
+    assert not any(storage.exists(name) for name in names), (
+        'Убедитесь, что при замене изображения публикации удаляются старый '
+        'файл и его уменьшенные копии.'
+    )
@@ -0,0 +1,46 @@
+from typing import List
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _explain_queries(client, url: str, table: str) -> List[str]:
+    with CaptureQueriesContext(connection) as context:
+        client.get(url)
+    plans = []
+    for query in context.captured_queries:
+        sql = query['sql']
+        if not sql.startswith('SELECT') or f'FROM "{table}"' not in sql:
+            continue
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            plans.append(' '.join(str(row[-1]) for row in cursor.fetchall()))
+    return plans
+
+
+@pytest.mark.parametrize(
+    'url_template, table, index_name',
+    [
+        ('/', 'blog_post', 'post_published_feed_idx'),
+        ('/category/{category.slug}/', 'blog_post',
+         'post_category_feed_idx'),
+        ('/profile/{author.username}/', 'blog_post', 'post_author_feed_idx'),
+        ('/posts/{post.id}/', 'blog_comment', 'comment_post_created_idx'),
+    ]
+)
+def test_list_queries_use_feed_indexes(
+        user_client, another_user_client, many_posts_with_published_locations,
+        url_template, table, index_name
+):
+    post = many_posts_with_published_locations[0]
+    url = url_template.format(
+        post=post, category=post.category, author=post.author)
+    for client in (user_client, another_user_client):
+        plans = _explain_queries(client, url, table)
+        assert any(index_name in plan for plan in plans), (
+            f'Убедитесь, что запрос публикаций страницы `{url}` '
+            f'использует индекс `{index_name}`. Планы запросов: {plans}'
+        )
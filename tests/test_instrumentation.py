@@ -0,0 +1,47 @@
+import logging
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+SQL_TIMING = re.compile(r'sql;dur=[\d.]+;desc="(\d+) queries"')
+
+
+@pytest.fixture
+def log(caplog):
+    logger = logging.getLogger('blogicum.instrumentation')
+    logger.addHandler(caplog.handler)
+    yield caplog
+    logger.removeHandler(caplog.handler)
+
+
+@pytest.mark.parametrize('url', ['/', '/feed/rss/'])
+def test_sampled_request_is_timed(user_client, log,
+                                  many_posts_with_published_locations, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.get(url)
+    server_timing = response['Server-Timing']
+    assert server_timing.startswith('total;dur='), (
+        'Убедитесь, что ответ содержит заголовок `Server-Timing`.'
+    )
+    assert int(SQL_TIMING.search(server_timing)[1]) == len(queries), (
+        'Убедитесь, что в `Server-Timing` указано число SQL-запросов.'
+    )
+    view = 'blog:index' if url == '/' else 'blog:feed'
+    assert f'view={view} ' in log.records[-1].getMessage()
+
+
+def test_template_render_is_timed(client, log,
+                                  post_with_published_location):
+    response = client.get(f'/posts/{post_with_published_location.id}/')
+    assert 'render;dur=' in response['Server-Timing']
+    assert 'render_ms=' in log.records[-1].getMessage()
+
+
+def test_unsampled_requests_are_not_timed(client, settings, log):
+    settings.INSTRUMENTATION_SAMPLE_RATE = 0
+    assert 'Server-Timing' not in client.get('/')
+    assert not log.records
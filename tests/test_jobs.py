@@ -0,0 +1,136 @@
+import re
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.registry import task
+from jobs.worker import claim_jobs, run_job, run_pending
+
+pytestmark = [pytest.mark.django_db]
+
+calls = []
+
+
+@task
+def flaky(fail_times: int):
+    calls.append(fail_times)
+    if len(calls) <= fail_times:
+        raise RuntimeError('boom')
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    calls.clear()
+
+
+def test_inline_jobs_run_right_away(settings):
+    settings.JOBS_RUN_INLINE = True
+    job = flaky.delay(0)
+    assert calls == [0], (
+        'Убедитесь, что при JOBS_RUN_INLINE задача выполняется сразу.'
+    )
+    assert job.status == Job.Status.DONE
+    assert not Job.objects.exists()
+
+
+def test_failed_job_is_retried_with_backoff():
+    job = flaky.delay(1)
+    assert run_pending() == 1
+    job.refresh_from_db()
+    assert job.status == Job.Status.QUEUED
+    assert job.attempts == 1
+    assert 'boom' in job.last_error
+    assert job.run_after > timezone.now(), (
+        'Убедитесь, что упавшая задача откладывается перед повтором.'
+    )
+
+    Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+    assert run_pending() == 1
+    job.refresh_from_db()
+    assert job.status == Job.Status.DONE
+    assert job.attempts == 2
+
+
+def test_job_fails_after_max_attempts():
+    job = flaky.delay(10)
+    Job.objects.filter(pk=job.pk).update(max_attempts=2)
+    for _ in range(2):
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        run_pending()
+    job.refresh_from_db()
+    assert job.status == Job.Status.FAILED
+    assert len(calls) == 2
+
+
+def test_claimed_job_is_invisible_until_timeout():
+    job = flaky.delay(0)
+    [claimed] = claim_jobs(10, visibility_timeout=60)
+    assert claim_jobs(10) == [], (
+        'Убедитесь, что взятая в работу задача не выдаётся другим '
+        'обработчикам.'
+    )
+    Job.objects.filter(pk=job.pk).update(
+        locked_until=timezone.now() - timedelta(seconds=1))
+    [reclaimed] = claim_jobs(10)
+    assert reclaimed.attempts == 2
+
+    # The worker that lost the claim must not overwrite the outcome.
+    run_job(claimed)
+    reclaimed.refresh_from_db()
+    assert reclaimed.status == Job.Status.RUNNING
+    run_job(reclaimed)
+    reclaimed.refresh_from_db()
+    assert reclaimed.status == Job.Status.DONE
+
+
+
+def test_job_that_kills_its_worker_fails_after_max_attempts():
+    job = flaky.delay(0)
+    Job.objects.filter(pk=job.pk).update(
+        status=Job.Status.RUNNING, attempts=job.max_attempts,
+        locked_until=timezone.now() - timedelta(seconds=1))
+    assert claim_jobs(10) == [], (
+        'Убедитесь, что задача, исчерпавшая попытки, не выдаётся снова '
+        'после истечения блокировки.'
+    )
+    job.refresh_from_db()
+    assert job.status == Job.Status.FAILED
+    assert job.locked_until is None
+    assert calls == []
+
+def test_runworker_once(user, client):
+    user.email = 'user@example.com'
+    user.save()
+    response = client.post('/auth/password_reset/',
+                           data={'email': user.email})
+    assert response.status_code == 302
+    assert mail.outbox == [], (
+        'Убедитесь, что письмо для сброса пароля отправляется в фоне.'
+    )
+    call_command('runworker', '--once')
+    assert len(mail.outbox) == 1
+    assert mail.outbox[0].to == [user.email]
+    assert not Job.objects.exclude(status=Job.Status.DONE).exists()
+
+
+def test_reset_token_is_not_stored_with_the_job(user, client):
+    user.email = 'user@example.com'
+    user.save()
+    client.post('/auth/password_reset/', data={'email': user.email})
+    job = Job.objects.get()
+    assert job.args[0] == user.pk
+    assert not any('/reset/' in str(arg) for arg in job.args), (
+        'Убедитесь, что ссылка для сброса пароля не сохраняется в '
+        'аргументах задачи.'
+    )
+    run_pending()
+    link = re.search(r'/auth/reset/\S+/', mail.outbox[0].body).group()
+    response = client.get(link, follow=True)
+    assert response.context['validlink'], (
+        'Убедитесь, что письмо, собранное в фоне, содержит рабочую ссылку '
+        'для сброса пароля.'
+    )
@@ -0,0 +1,129 @@
+import re
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+from blog.views import COMMENTSINPAGE
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+CURSOR_RE = re.compile(r'href="\?cursor=([\w-]+)"')
+
+
+def _get_cursors(content: str):
+    return CURSOR_RE.findall(content)
+
+
+def test_cursor_walk_covers_feed(
+        user_client, many_posts_with_published_locations
+):
+    visible_posts = [
+        post for post in many_posts_with_published_locations
+        if post.pub_date <= timezone.now()
+    ]
+    expected_ids = [
+        post.id for post in sorted(
+            visible_posts, key=lambda post: (post.pub_date, post.id),
+            reverse=True)
+    ]
+    seen_ids = []
+    url = '/'
+    pages = []
+    while url:
+        response = user_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        page_obj = response.context['page_obj']
+        pages.append([post.id for post in page_obj])
+        seen_ids.extend(pages[-1])
+        url = (f'/?cursor={page_obj.next_cursor}'
+               if page_obj.has_next() else None)
+    assert seen_ids == expected_ids, (
+        'Убедитесь, что при переходе по курсорам главной страницы '
+        'каждая публикация выводится ровно один раз и в порядке '
+        '«от новых к старым».'
+    )
+    assert len(pages[0]) == min(N_PER_PAGE, len(expected_ids))
+
+    if len(pages) > 1:
+        response = user_client.get(f'/?cursor={page_obj.previous_cursor}')
+        assert [post.id for post in response.context['page_obj']] == (
+            pages[-2]
+        ), 'Убедитесь, что курсор «назад» возвращает предыдущую страницу.'
+
+
+def test_paginator_renders_cursor_links(
+        user_client, many_posts_with_published_locations
+):
+    content = user_client.get('/').content.decode('utf-8')
+    assert _get_cursors(content), (
+        'Убедитесь, что шаблон `includes/paginator.html` выводит ссылки '
+        'на следующую страницу по курсору.'
+    )
+    assert '?page=' not in content
+
+
+def test_legacy_page_numbers_still_work(
+        user_client, many_posts_with_published_locations
+):
+    response = user_client.get('/?page=2')
+    assert response.status_code == HTTPStatus.OK
+    assert response.context['page_obj'].number == 2
+
+
+@pytest.mark.parametrize('cursor', ['garbage', 'WyJ4IiwgWzFdXQ'])
+def test_invalid_cursor_returns_404(user_client, cursor):
+    response = user_client.get(f'/?cursor={cursor}')
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_comments_are_loaded_in_batches(
+        user_client, another_user_client, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    comments = mixer.cycle(COMMENTSINPAGE + 5).blend(
+        'blog.Comment', post=post)
+    response = user_client.get(f'/posts/{post.id}/')
+    first_batch = list(response.context['comments'])
+    assert first_batch == comments[:COMMENTSINPAGE], (
+        'Убедитесь, что на странице публикации выводится только первая '
+        'порция комментариев, «от старых к новым».'
+    )
+    more_url = re.search(
+        r'href="(/posts/\d+/comments/\?cursor=[\w-]+)"',
+        response.content.decode('utf-8')).group(1)
+
+    response = user_client.get(more_url)
+    assert response.status_code == HTTPStatus.OK
+    assert list(response.context['comments']) == comments[COMMENTSINPAGE:]
+    assert 'comments/?cursor=' not in response.content.decode('utf-8')
+
+    post.is_published = False
+    post.save()
+    assert another_user_client.get(more_url).status_code == (
+        HTTPStatus.NOT_FOUND)
+
+
+def test_offset_pages_are_elided_and_counted_once(
+        user_client, mixer, published_category, django_assert_num_queries
+):
+    mixer.cycle(N_PER_PAGE * 12).blend(
+        'blog.Post', category=published_category, is_published=True,
+        pub_date=timezone.now())
+    content = user_client.get('/?page=6').content.decode('utf-8')
+    page_links = re.findall(r'href="\?page=(\d+)"', content)
+    assert set(page_links) == {'1', '4', '5', '7', '8', '12'}, (
+        'Убедитесь, что пагинатор выводит только соседние и крайние '
+        'страницы, а не ссылки на все страницы.'
+    )
+    assert '…' in content
+
+    # Session, user and the page itself: the total comes from the cache.
+    with django_assert_num_queries(3):
+        user_client.get('/?page=7')
+    # A new post drops the cached total: COUNT(*) and the lookup of the
+    # next scheduled publication that bounds the cache timeout run again.
+    mixer.blend('blog.Post', category=published_category)
+    with django_assert_num_queries(5):
+        user_client.get('/?page=7')
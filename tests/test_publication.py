@@ -0,0 +1,44 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.models import Post
+from blog.publication import (
+    get_next_publication,
+    seconds_until_next_publication,
+)
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_post_published_after_start_is_visible(
+        user_client, mixer, published_category
+):
+    post = mixer.blend(
+        'blog.Post', category=published_category, is_published=True,
+        pub_date=timezone.now())
+    posts = user_client.get('/').context['page_obj']
+    assert post in posts, (
+        'Убедитесь, что время публикации сравнивается с текущим временем '
+        'запроса, а не со временем запуска сервера.'
+    )
+
+
+def test_next_publication_boundary(mixer, published_category):
+    assert get_next_publication() is None
+    assert seconds_until_next_publication(300) == 300
+
+    soon = timezone.now() + timedelta(seconds=90)
+    mixer.blend('blog.Post', category=published_category,
+                is_published=True, pub_date=soon)
+    mixer.blend('blog.Post', category=published_category,
+                is_published=True, pub_date=soon + timedelta(days=1))
+    assert get_next_publication() == soon
+    assert 0 < seconds_until_next_publication(300) <= 90
+
+    Post.objects.filter(pub_date=soon).delete()
+    assert get_next_publication() == soon + timedelta(days=1), (
+        'Убедитесь, что граница ближайшей отложенной публикации '
+        'пересчитывается после изменения публикаций.'
+    )
@@ -0,0 +1,104 @@
+"""Exact number of SQL queries per blog page.
+
+A changed number here is a performance regression (or improvement) of the
+page: update the expectation only together with the change that explains
+it. Pages with an ETag spend one query on their validator.
+"""
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+# Session and user lookups of the logged in client.
+AUTH_QUERIES = 2
+
+
+@pytest.fixture
+def post(mixer, many_posts_with_published_locations):
+    post = many_posts_with_published_locations[0]
+    mixer.cycle(3).blend('blog.Comment', post=post)
+    return post
+
+
+@pytest.fixture
+def comment(mixer, post, user):
+    return mixer.blend('blog.Comment', post=post, author=user)
+
+
+@pytest.mark.parametrize(
+    'url_template, expected_queries',
+    [
+        ('/', 2),
+        ('/category/{post.category.slug}/', 3),
+        ('/profile/{post.author.username}/', 3),
+        ('/posts/{post.id}/', 3),
+        ('/posts/{post.id}/edit/', 3),
+        ('/posts/{post.id}/delete/', 1),
+        ('/posts/{post.id}/edit_comment/{comment.id}/', 1),
+        ('/posts/{post.id}/delete_comment/{comment.id}/', 1),
+        ('/posts/create/', 2),
+        ('/profile/current/edit/', 0),
+    ]
+)
+def test_author_query_count(
+        user_client, post, comment, django_assert_num_queries,
+        url_template, expected_queries
+):
+    url = url_template.format(post=post, comment=comment)
+    with django_assert_num_queries(AUTH_QUERIES + expected_queries):
+        user_client.get(url)
+
+
+@pytest.mark.parametrize(
+    'url_template, expected_queries',
+    [
+        # Cache misses also look up the next scheduled publication.
+        ('/', 3),
+        ('/category/{post.category.slug}/', 4),
+        ('/profile/{post.author.username}/', 3),
+        ('/posts/{post.id}/', 3),
+    ]
+)
+def test_anonymous_query_count(
+        client, post, django_assert_num_queries,
+        url_template, expected_queries
+):
+    url = url_template.format(post=post)
+    with django_assert_num_queries(expected_queries):
+        client.get(url)
+
+
+def test_anonymous_cached_feed_query_count(
+        client, post, django_assert_num_queries
+):
+    client.get('/')
+    with django_assert_num_queries(0):
+        client.get('/')
+
+
+def test_add_comment_query_count(
+        another_user_client, post, django_assert_num_queries
+):
+    # Visibility check, savepoint pair, INSERT and counter UPDATE.
+    with django_assert_num_queries(AUTH_QUERIES + 5):
+        another_user_client.post(f'/posts/{post.id}/comment/',
+                                 data={'text': 'Текст'})
+
+
+@pytest.mark.parametrize(
+    'url_template, expected_queries',
+    [
+        ('/', 1),
+        ('/category/{post.category.slug}/', 2),
+        ('/profile/{post.author.username}/', 2),
+        ('/posts/{post.id}/', 1),
+    ]
+)
+def test_not_modified_query_count(
+        user_client, post, django_assert_num_queries, url_template,
+        expected_queries
+):
+    url = url_template.format(post=post)
+    etag = user_client.get(url)['ETag']
+    with django_assert_num_queries(AUTH_QUERIES + expected_queries):
+        response = user_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
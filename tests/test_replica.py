@@ -0,0 +1,113 @@
+import sqlite3
+import time
+from datetime import timedelta
+
+import pytest
+from django.contrib.sessions.models import Session
+from django.core.management import CommandError, call_command
+from django.db import connections, router
+from django.test import RequestFactory
+from django.utils import timezone
+
+from blog.models import Post
+from blogicum.routers import (
+    PIN_SESSION_KEY,
+    REPLICA_ALIAS,
+    reading_from_replica,
+)
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.filterwarnings('ignore:Overriding setting DATABASES'),
+]
+
+
+@pytest.fixture
+def replica(settings, tmp_path):
+    path = tmp_path / 'replica.sqlite3'
+    settings.DATABASES = {
+        **settings.DATABASES,
+        REPLICA_ALIAS: {**settings.DATABASES['default'], 'NAME': path},
+    }
+    # The connection handler reads DATABASES only once.
+    saved = connections.settings
+    connections.settings = connections.configure_settings(
+        settings.DATABASES)
+    yield path
+    connections.close_all()
+    if hasattr(connections._connections, REPLICA_ALIAS):
+        delattr(connections._connections, REPLICA_ALIAS)
+    connections.settings = saved
+
+
+def _request(session=None):
+    request = RequestFactory().get('/')
+    request.session = session or {}
+    return request
+
+
+def test_reads_go_to_replica_only_when_asked(replica):
+    assert router.db_for_read(Post) == 'default'
+    with reading_from_replica(_request()):
+        assert router.db_for_read(Post) == REPLICA_ALIAS, (
+            'Убедитесь, что страницы только для чтения читают из реплики.'
+        )
+        assert router.db_for_read(Session) == 'default'
+        assert router.db_for_write(Post) == 'default'
+    assert router.db_for_read(Post) == 'default'
+
+
+def test_pinned_session_reads_from_primary(replica):
+    request = _request({PIN_SESSION_KEY: time.time() + 10})
+    with reading_from_replica(request):
+        assert router.db_for_read(Post) == 'default', (
+            'Убедитесь, что после записи сессия читает из основной базы.'
+        )
+
+
+def test_without_replica_everything_uses_default():
+    with reading_from_replica(_request()):
+        assert router.db_for_read(Post) == 'default'
+
+
+def test_writes_pin_the_session(replica, user_client,
+                                post_with_published_location):
+    response = user_client.post(
+        f'/posts/{post_with_published_location.id}/comment/',
+        data={'text': 'Комментарий'})
+    assert response.status_code == 302
+    assert user_client.session[PIN_SESSION_KEY] > time.time(), (
+        'Убедитесь, что после записи сессия закрепляется за основной базой.'
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_replicate_db_copies_the_database(replica, mixer):
+    post = mixer.blend('blog.Post', title='Скопированная публикация')
+    call_command('replicate_db')
+    with sqlite3.connect(replica) as copy:
+        titles = [title for title, in copy.execute(
+            'SELECT title FROM blog_post')]
+    assert post.title in titles
+
+
+def test_replicate_db_needs_a_replica():
+    with pytest.raises(CommandError):
+        call_command('replicate_db')
+
+
+@pytest.mark.django_db(transaction=True)
+def test_feed_cached_from_a_lagging_replica_expires_on_copy(
+        replica, client, mixer
+):
+    call_command('replicate_db')
+    post = mixer.blend('blog.Post', is_published=True,
+                       category__is_published=True,
+                       pub_date=timezone.now() - timedelta(days=1))
+    # The write has bumped the generation, the replica does not have it.
+    assert post.title not in client.get('/').content.decode()
+    call_command('replicate_db')
+    assert post.title in client.get('/').content.decode(), (
+        'Убедитесь, что после копирования в реплику кеш ленты, '
+        'собранный из отстающей реплики, сбрасывается.'
+    )
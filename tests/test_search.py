@@ -0,0 +1,234 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import OperationalError, connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import Post
+from conftest import N_PER_PAGE
+from search.backends import fts5, get_backend, inverted
+from search.backends.fts5 import build_match_query
+from search.backends.inverted import InvertedIndexBackend, Segment
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True, params=[
+    'search.backends.fts5.FTS5Backend',
+    'search.backends.inverted.InvertedIndexBackend',
+])
+def search_backend(request, settings, tmp_path):
+    settings.SEARCH_BACKEND = request.param
+    settings.SEARCH_INDEX_DIR = tmp_path / 'search_index'
+    return get_backend()
+
+
+@pytest.fixture
+def posts(mixer, user, published_category,
+          django_capture_on_commit_callbacks):
+    def blend(title, text, **kwargs):
+        fields = {'is_published': True,
+                  'pub_date': timezone.now() - timedelta(days=1),
+                  **kwargs}
+        # The inverted index journals posts once the save is committed.
+        with django_capture_on_commit_callbacks(execute=True):
+            return mixer.blend('blog.Post', author=user, title=title,
+                               text=text, category=published_category,
+                               **fields)
+    return {
+        'title': blend('Поход на Эльбрус', 'Заметки о дороге'),
+        'text': blend('Заметки', 'Весь день шли к Эльбрусу и к вершине '
+                      'Эльбрус'),
+        'hidden': blend('Эльбрус зимой', 'Черновик', is_published=False),
+        'future': blend('Эльбрус летом', 'Скоро',
+                        pub_date=timezone.now() + timedelta(days=1)),
+        'other': blend('Море', 'Про пляж <b>и</b> волны'),
+    }
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('', None),
+    ('  ?! ', None),
+    ('горы', '"горы"*'),
+    ('"AND" OR NEAR(', '"AND" "OR" "NEAR"*'),
+])
+def test_build_match_query(query, expected):
+    assert build_match_query(query) == expected
+
+
+def test_search_ranks_visible_posts(client, posts):
+    response = client.get('/search/', {'q': 'эльбрус'})
+    assert response.status_code == HTTPStatus.OK
+    found = list(response.context['page_obj'])
+    assert set(found) == {posts['title'], posts['text']}, (
+        'Убедитесь, что поиск находит только опубликованные публикации и '
+        'учитывает правила видимости главной страницы.'
+    )
+    assert found[0] == posts['title'], (
+        'Убедитесь, что совпадение в заголовке ранжируется выше '
+        'совпадения в тексте.'
+    )
+    content = response.content.decode()
+    assert '<mark>Эльбрусу</mark>' in content
+    assert '<mark>Эльбрус</mark>' in content
+
+
+def test_pages_keep_the_query(client, mixer, published_category,
+                              django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        mixer.cycle(N_PER_PAGE + 1).blend(
+            'blog.Post', title='Кедр', category=published_category,
+            is_published=True, pub_date=timezone.now() - timedelta(days=1))
+    content = client.get('/search/', {'q': 'Кедр'}).content.decode()
+    assert 'href="?q=%D0%9A%D0%B5%D0%B4%D1%80&page=2"' in content
+
+
+def test_snippets_are_escaped(client, posts):
+    content = client.get('/search/', {'q': 'волны'}).content.decode()
+    assert '<mark>волны</mark>' in content
+    assert '&lt;b&gt;и&lt;/b&gt;' in content
+
+
+def test_index_follows_edits_and_deletes(
+        client, posts, django_capture_on_commit_callbacks
+):
+    post = posts['other']
+    post.title = 'Пустыня'
+    with django_capture_on_commit_callbacks(execute=True):
+        post.save()
+    assert list(client.get('/search/', {'q': 'Пустыня'})
+                .context['page_obj']) == [post]
+    assert not list(client.get('/search/', {'q': 'Море'})
+                    .context['page_obj'])
+    with django_capture_on_commit_callbacks(execute=True):
+        post.delete()
+    assert not list(client.get('/search/', {'q': 'Пустыня'})
+                    .context['page_obj'])
+
+
+def test_rebuild_command(client, posts):
+    call_command('rebuild_search_index')
+    assert len(client.get('/search/', {'q': 'Заметки'})
+               .context['page_obj']) == 2
+
+
+def test_admin_search_uses_index(admin_client, posts):
+    response = admin_client.get('/admin/blog/post/', {'q': 'Эльбрус'})
+    assert response.status_code == HTTPStatus.OK
+    assert set(response.context['cl'].result_list) == {
+        posts['title'], posts['text'], posts['hidden'], posts['future']}
+
+
+@pytest.mark.parametrize('search_backend', [
+    'search.backends.inverted.InvertedIndexBackend',
+], indirect=True)
+def test_inverted_index_is_shared_through_files(
+        search_backend, posts, django_capture_on_commit_callbacks
+):
+    writer = search_backend
+    writer.rebuild()
+    segment = Segment(writer.directory / 'segment')
+    assert segment.post_count == len(posts)
+    assert [segment.term(index) for index in segment.find(
+        'эльбрус'.encode(), prefix=True)] == [
+            'эльбрус'.encode(), 'эльбрусу'.encode()]
+
+    reader = InvertedIndexBackend()
+    post = posts['other']
+    post.text = 'Шторм'
+    with django_capture_on_commit_callbacks(execute=True):
+        post.save()
+    assert reader.match('шторм') == [post.id], (
+        'Убедитесь, что изменения публикаций, сделанные в одном процессе, '
+        'видны поиску в остальных процессах.'
+    )
+    assert reader.match('волны') == []
+
+    writer.rebuild()
+    assert reader.match('шторм') == [post.id]
+    assert (writer.directory / 'journal').stat().st_size == 0
+
+
+@pytest.mark.parametrize('search_backend', [
+    'search.backends.fts5.FTS5Backend',
+], indirect=True)
+def test_falls_back_without_fts5(
+        search_backend, monkeypatch, client, mixer, published_category,
+        django_capture_on_commit_callbacks
+):
+    monkeypatch.setattr(fts5, 'has_fts5', lambda: False)
+    get_backend.cache_clear()
+    assert isinstance(get_backend(), InvertedIndexBackend), (
+        'Убедитесь, что без FTS5 поиск использует инвертированный индекс.'
+    )
+    with django_capture_on_commit_callbacks(execute=True):
+        post = mixer.blend('blog.Post', title='Ледник', is_published=True,
+                           category=published_category,
+                           pub_date=timezone.now() - timedelta(days=1))
+    assert list(client.get('/search/', {'q': 'ледник'})
+                .context['page_obj']) == [post]
+
+
+def test_index_errors_do_not_block_saves(
+        search_backend, monkeypatch, user_client, published_category,
+        published_location
+):
+    def fail(post):
+        raise OperationalError('no such table: search_post_fts')
+
+    monkeypatch.setattr(search_backend, 'index_post', fail)
+    response = user_client.post('/posts/create/', data={
+        'title': 'Ледник', 'text': 'Текст', 'pub_date': '2020-01-01 10:00:00',
+        'category': published_category.id,
+        'location': published_location.id, 'is_published': True,
+    })
+    assert response.status_code == HTTPStatus.FOUND, (
+        'Убедитесь, что ошибка поискового индекса не мешает сохранить '
+        'публикацию.'
+    )
+    assert Post.objects.filter(title='Ледник').exists()
+
+
+@pytest.mark.parametrize('search_backend', [
+    'search.backends.inverted.InvertedIndexBackend',
+], indirect=True)
+def test_inverted_index_binds_ids_in_batches(
+        search_backend, monkeypatch, client, admin_client, mixer,
+        published_category, django_capture_on_commit_callbacks
+):
+    monkeypatch.setattr(inverted, 'ID_BATCH_SIZE', 3)
+    with django_capture_on_commit_callbacks(execute=True):
+        posts = mixer.cycle(N_PER_PAGE + 1).blend(
+            'blog.Post', title='Кедр', category=published_category,
+            is_published=True, pub_date=timezone.now() - timedelta(days=1))
+    with CaptureQueriesContext(connection) as queries:
+        first = client.get('/search/', {'q': 'Кедр'})
+    assert len(first.context['page_obj']) == N_PER_PAGE
+    assert not any('CASE' in query['sql'] for query in queries), (
+        'Убедитесь, что порядок результатов не передаётся в запрос '
+        'параметрами.'
+    )
+    last = client.get('/search/', {'q': 'Кедр', 'page': 2})
+    found = [*first.context['page_obj'], *last.context['page_obj']]
+    assert found == sorted(posts, key=lambda post: -post.id)
+
+    response = admin_client.get('/admin/blog/post/', {'q': 'Кедр'})
+    assert len(response.context['cl'].result_list) == 3
+
+
+def test_marker_characters_in_posts_are_not_tags(
+        client, mixer, published_category, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        mixer.blend('blog.Post', title='Лёд', text='Ледник \x03 и \x02 лёд',
+                    category=published_category, is_published=True,
+                    pub_date=timezone.now() - timedelta(days=1))
+    content = client.get('/search/', {'q': 'ледник'}).content.decode()
+    assert content.count('<mark>') == content.count('</mark>') == 1, (
+        'Убедитесь, что символы разметки совпадений из текста публикации '
+        'не превращаются в теги.'
+    )
+    assert '\x02' not in content and '\x03' not in content
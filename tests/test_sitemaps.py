@@ -0,0 +1,93 @@
+from datetime import timedelta
+from http import HTTPStatus
+from xml.etree import ElementTree
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog import sitemaps
+
+pytestmark = [pytest.mark.django_db]
+
+NS = '{http://www.sitemaps.org/schemas/sitemap/0.9}'
+
+
+def _locations(content: bytes):
+    return [loc.text for loc in ElementTree.fromstring(content).iter(
+        f'{NS}loc')]
+
+
+@pytest.fixture
+def sitemap_posts(mixer, user, published_category, monkeypatch):
+    monkeypatch.setattr(sitemaps, 'POSTS_PER_SITEMAP', 2)
+    now = timezone.now()
+    posts = mixer.cycle(3).blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, pub_date=now - timedelta(days=1))
+    mixer.blend('blog.Post', category=published_category,
+                is_published=False, pub_date=now - timedelta(days=1))
+    return posts
+
+
+def test_sitemap_index(client, sitemap_posts):
+    response = client.get('/sitemap.xml')
+    assert response.status_code == HTTPStatus.OK
+    assert response.streaming
+    chunks = sorted({(post.id - 1) // 2 + 1 for post in sitemap_posts})
+    assert _locations(b''.join(response.streaming_content)) == [
+        *(f'http://testserver/sitemap-posts-{chunk}.xml'
+          for chunk in chunks),
+        'http://testserver/sitemap-categories.xml',
+        'http://testserver/sitemap-profiles.xml',
+    ], (
+        'Убедитесь, что индекс карт сайта ссылается на карты публикаций, '
+        'категорий и профилей.'
+    )
+
+
+def test_sitemaps_list_visible_objects(
+        client, user, published_category, sitemap_posts
+):
+    posts = []
+    for chunk in sorted({(post.id - 1) // 2 + 1 for post in sitemap_posts}):
+        response = client.get(f'/sitemap-posts-{chunk}.xml')
+        posts += _locations(b''.join(response.streaming_content))
+    assert posts == [f'http://testserver/posts/{post.id}/'
+                     for post in sitemap_posts]
+    content = b''.join(
+        client.get('/sitemap-categories.xml').streaming_content)
+    assert _locations(content) == [
+        f'http://testserver/category/{published_category.slug}/']
+    post = sitemap_posts[0]
+    lastmod = max(post.pub_date, post.updated_at).date().isoformat()
+    assert f'<lastmod>{lastmod}</lastmod>'.encode() in content
+    content = b''.join(client.get('/sitemap-profiles.xml').streaming_content)
+    assert _locations(content) == [
+        f'http://testserver/profile/{user.username}/']
+    assert client.get('/sitemap-users.xml').status_code == (
+        HTTPStatus.NOT_FOUND)
+
+
+def test_post_sitemap_beyond_the_last_chunk_is_404(client, sitemap_posts):
+    last_chunk = (sitemap_posts[-1].id - 1) // 2 + 1
+    url = '/sitemap-posts-{}.xml'
+    assert client.get(url.format(last_chunk)).status_code == HTTPStatus.OK
+    assert client.get(url.format(last_chunk + 1)).status_code == (
+        HTTPStatus.NOT_FOUND), (
+        'Убедитесь, что карта сайта пустой части публикаций отвечает 404.'
+    )
+
+
+def test_render_sitemaps(tmp_path, sitemap_posts):
+    (tmp_path / 'sitemap-posts-999.xml').write_bytes(b'stale')
+    call_command('render_sitemaps', 'https://blogicum.example/',
+                 '--output', str(tmp_path))
+    first_chunk = (sitemap_posts[0].id - 1) // 2 + 1
+    assert {path.name for path in tmp_path.iterdir()} == {
+        'sitemap-categories.xml', f'sitemap-posts-{first_chunk}.xml',
+        f'sitemap-posts-{first_chunk + 1}.xml', 'sitemap-profiles.xml',
+        'sitemap.xml',
+    }
+    assert _locations((tmp_path / 'sitemap.xml').read_bytes())[0] == (
+        f'https://blogicum.example/sitemap-posts-{first_chunk}.xml')
@@ -0,0 +1,85 @@
+import sqlite3
+import threading
+
+import pytest
+from django.db import OperationalError, connection
+
+from blogicum.sqlite.base import DatabaseWrapper
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def file_database(tmp_path):
+    def connect(**options):
+        return DatabaseWrapper({
+            **connection.settings_dict,
+            'NAME': str(tmp_path / 'db.sqlite3'),
+            'OPTIONS': {'timeout': 0.01, **options},
+        }, alias='scratch')
+
+    database = connect()
+    with database.cursor() as cursor:
+        cursor.execute('CREATE TABLE comment (text TEXT)')
+    database.close()
+    yield connect
+
+
+@pytest.fixture
+def writer(tmp_path):
+    """Another process' connection holding the write lock."""
+    raw = sqlite3.connect(tmp_path / 'db.sqlite3', check_same_thread=False,
+                          isolation_level=None)
+    raw.execute('BEGIN IMMEDIATE')
+    raw.execute("INSERT INTO comment VALUES ('first')")
+    yield raw
+    raw.close()
+
+
+def test_pragmas_are_applied():
+    with connection.cursor() as cursor:
+        values = {}
+        for pragma in ('synchronous', 'cache_size', 'temp_store'):
+            cursor.execute(f'PRAGMA {pragma}')
+            values[pragma] = cursor.fetchone()[0]
+    assert values == {'synchronous': 1, 'cache_size': -20000,
+                      'temp_store': 2}, (
+        'Убедитесь, что при подключении к базе данных задаются PRAGMA.'
+    )
+
+
+def test_readers_do_not_wait_for_writer(file_database, writer):
+    database = file_database(lock_retries=0)
+    with database.cursor() as cursor:
+        cursor.execute('PRAGMA journal_mode')
+        assert cursor.fetchone()[0] == 'wal'
+        cursor.execute('SELECT COUNT(*) FROM comment')
+        assert cursor.fetchone()[0] == 0
+    database.close()
+
+
+def test_locked_writes_are_retried(file_database, writer):
+    threading.Timer(0.1, writer.execute, ('COMMIT',)).start()
+    database = file_database(lock_retries=5)
+    with database.cursor() as cursor:
+        cursor.execute("INSERT INTO comment VALUES ('second')")
+        cursor.execute('SELECT COUNT(*) FROM comment')
+        assert cursor.fetchone()[0] == 2
+    database.close()
+
+
+def test_retries_are_bounded(file_database, writer):
+    database = file_database(lock_retries=0)
+    with pytest.raises(OperationalError, match='locked'):
+        with database.cursor() as cursor:
+            cursor.execute("INSERT INTO comment VALUES ('second')")
+    database.close()
+
+
+def test_closed_connection_is_not_usable(file_database):
+    database = file_database()
+    database.ensure_connection()
+    assert database.is_usable()
+    database.connection.close()
+    assert not database.is_usable()
+    database.connection = None
@@ -0,0 +1,71 @@
+from datetime import timedelta
+
+import pytest
+from django.conf import settings
+from django.contrib.admin.sites import site
+from django.core.management import call_command
+from django.test import RequestFactory
+from django.utils import timezone
+
+from blog.admin import publish, unpublish
+from blog.models import Category, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _age(obj, model):
+    # Move the stamp into the past so that any touch is visible.
+    past = timezone.now() - timedelta(days=1)
+    model.objects.filter(pk=obj.pk).update(updated_at=past)
+    return past
+
+
+def test_save_and_bulk_update_touch_updated_at(
+        mixer, post_with_published_location
+):
+    post = post_with_published_location
+    past = _age(post, Post)
+    Post.objects.filter(pk=post.pk).update(title='Новый заголовок')
+    post.refresh_from_db()
+    assert post.updated_at > past, (
+        'Убедитесь, что `queryset.update()` обновляет `updated_at`.'
+    )
+
+    past = _age(post, Post)
+    post.text = 'Новый текст'
+    post.save()
+    post.refresh_from_db()
+    assert post.updated_at > past, (
+        'Убедитесь, что сохранение обновляет `updated_at`.'
+    )
+
+    past = _age(post, Post)
+    mixer.blend('blog.Comment', post=post)
+    post.refresh_from_db()
+    assert post.updated_at > past, (
+        'Убедитесь, что новый комментарий обновляет `updated_at` публикации.'
+    )
+
+
+@pytest.mark.parametrize('action, is_published', [
+    (publish, True),
+    (unpublish, False),
+])
+def test_admin_actions_touch_updated_at(
+        post_with_published_location, action, is_published
+):
+    category = post_with_published_location.category
+    past = _age(category, Category)
+    request = RequestFactory().post('/admin/blog/category/')
+    action(site._registry[Category], request,
+           Category.objects.filter(pk=category.pk))
+    category.refresh_from_db()
+    assert category.is_published is is_published
+    assert category.updated_at > past
+
+
+def test_fixtures_without_updated_at_load():
+    call_command('loaddata', str(settings.BASE_DIR / 'db.json'),
+                 verbosity=0)
+    category = Category.objects.get(pk=1)
+    assert category.updated_at == category.created_at